@@ -2,37 +2,20 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import functools
+import heapq
+import os
+from collections.abc import Iterator
+from datetime import UTC, datetime
 from pathlib import Path
 
 import click
 
 from . import __version__
-from .config import (
-    Config,
-    get_default_config_path,
-    get_last_sync,
-    get_pid_file_path,
-    save_last_sync,
-)
-from .daemon import (
-    generate_launchd_plist,
-    generate_systemd_service,
-    get_daemon_status,
-    get_default_log_path,
-    get_launchd_plist_path,
-    get_systemd_service_path,
-    start_daemon,
-    stop_daemon,
-    uninstall_service,
-)
-from .sync import (
-    PublicRepositoryError,
-    RepositoryVisibility,
-    check_push_permission,
-    git_commit_and_push,
-    sync_logs,
-)
+from .config import Config, clear_config_cache, get_default_config_path, get_pid_file_path
+
+# Heavy submodules (daemon, sync) are imported inside the commands that use them
+# so that `ccjournal --help` and `ccjournal config ...` stay fast.
 
 
 @click.group()
@@ -86,6 +69,7 @@ def init(ctx: click.Context) -> None:
     config.output.auto_push = auto_push
 
     config.save(config_path)
+    clear_config_cache()
 
     click.echo(f"\nConfiguration saved to {config_path}")
 
@@ -124,7 +108,14 @@ def sync(
     force: bool,
 ) -> None:
     """Sync conversation logs to the output repository."""
-    from datetime import UTC
+    from .config import get_last_sync, save_last_sync
+    from .sync import (
+        PublicRepositoryError,
+        RepositoryVisibility,
+        check_push_permission,
+        git_commit_and_push,
+        sync_logs,
+    )
 
     config: Config = ctx.obj["config"]
 
@@ -147,20 +138,23 @@ def sync(
     if dry_run:
         click.echo("Dry run mode - no changes will be made\n")
 
-    # Run sync
-    written_paths = sync_logs(config, date_filter=date_filter, dry_run=dry_run, since=since)
-
-    # Save current timestamp as last sync (unless dry run)
-    if not dry_run and written_paths:
-        save_last_sync(datetime.now(UTC))
+    # Run sync, echoing each path as it is written
+    count = 0
+    for path in sync_logs(config, date_filter=date_filter, dry_run=dry_run, since=since):
+        if count == 0:
+            click.echo(f"{'Would write' if dry_run else 'Wrote'} file(s):")
+        count += 1
+        click.echo(f"  - {path}")
 
-    if not written_paths:
+    if count == 0:
         click.echo("No logs to sync.")
         return
 
-    click.echo(f"{'Would write' if dry_run else 'Wrote'} {len(written_paths)} file(s):")
-    for path in written_paths:
-        click.echo(f"  - {path}")
+    click.echo(f"{count} file(s) total.")
+
+    # Save current timestamp as last sync (unless dry run)
+    if not dry_run:
+        save_last_sync(datetime.now(UTC))
 
     if dry_run:
         return
@@ -177,7 +171,7 @@ def sync(
                 allow_unknown=config.output.allow_unknown_visibility,
             )
             if not result.allowed:
-                if result.visibility == RepositoryVisibility.PUBLIC:
+                if result.visibility is RepositoryVisibility.PUBLIC:
                     raise PublicRepositoryError(config.output.repository)
                 # UNKNOWN visibility - don't push but continue with commit
                 click.echo(f"\nError: {result.warning_message}", err=True)
@@ -217,33 +211,37 @@ def config_show(ctx: click.Context) -> None:
     config: Config = ctx.obj["config"]
     config_path = get_default_config_path()
 
-    click.echo(f"Configuration file: {config_path}")
-    click.echo(f"  exists: {config_path.exists()}\n")
-
-    click.echo("[output]")
-    click.echo(f"  repository: {config.output.repository}")
-    click.echo(f"  structure: {config.output.structure}")
-    click.echo(f"  remote: {config.output.remote}")
-    click.echo(f"  branch: {config.output.branch}")
-    click.echo(f"  auto_push: {config.output.auto_push}")
-    click.echo(f"  allow_public_repository: {config.output.allow_public_repository}")
-    click.echo(f"  allow_unknown_visibility: {config.output.allow_unknown_visibility}")
-
-    click.echo("\n[sync]")
-    click.echo(f"  interval: {config.sync.interval}")
-    click.echo(f"  exclude_system: {config.sync.exclude_system}")
-    click.echo(f"  exclude_tool_messages: {config.sync.exclude_tool_messages}")
+    lines = [
+        f"Configuration file: {config_path}",
+        f"  exists: {config_path.exists()}",
+        "",
+        "[output]",
+        f"  repository: {config.output.repository}",
+        f"  structure: {config.output.structure}",
+        f"  remote: {config.output.remote}",
+        f"  branch: {config.output.branch}",
+        f"  auto_push: {config.output.auto_push}",
+        f"  allow_public_repository: {config.output.allow_public_repository}",
+        f"  allow_unknown_visibility: {config.output.allow_unknown_visibility}",
+        "",
+        "[sync]",
+        f"  interval: {config.sync.interval}",
+        f"  exclude_system: {config.sync.exclude_system}",
+        f"  exclude_tool_messages: {config.sync.exclude_tool_messages}",
+    ]
 
     if config.project_aliases:
-        click.echo("\n[projects.aliases]")
+        lines.append("")
+        lines.append("[projects.aliases]")
         for original, alias in config.project_aliases.items():
-            click.echo(f'  "{original}" = "{alias}"')
+            lines.append(f'  "{original}" = "{alias}"')
+
+    click.echo("\n".join(lines))
 
 
 @config_cmd.command(name="edit")
 def config_edit() -> None:
     """Open configuration file in editor."""
-    import os
     import subprocess
 
     config_path = get_default_config_path()
@@ -262,6 +260,8 @@ def config_edit() -> None:
 @click.pass_context
 def list_logs(ctx: click.Context, limit: int) -> None:
     """List recent synced logs."""
+    import time
+
     config: Config = ctx.obj["config"]
     repo = config.output.repository
 
@@ -269,19 +269,53 @@ def list_logs(ctx: click.Context, limit: int) -> None:
         click.echo(f"Repository does not exist: {repo}")
         return
 
-    # Find all markdown files
-    md_files = sorted(repo.rglob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
-
-    if not md_files:
+    # Keep only the `limit` most recently modified markdown files (min-heap on mtime)
+    recent: list[tuple[float, str]] = []
+    total = 0
+    for entry in _iter_markdown_files(repo):
+        total += 1
+        if len(recent) < limit:
+            heapq.heappush(recent, entry)
+        elif limit > 0:
+            heapq.heappushpop(recent, entry)
+
+    if not total:
         click.echo("No logs found.")
         return
 
-    click.echo(f"Recent logs (showing {min(limit, len(md_files))} of {len(md_files)}):\n")
+    recent.sort(reverse=True)
+    click.echo(f"Recent logs (showing {len(recent)} of {total}):\n")
+
+    # mtime comes from the stat done during the scan; format it without a datetime
+    for mtime, md_file in recent:
+        rel_path = Path(md_file).relative_to(repo)
+        modified = time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))
+        click.echo(f"  {rel_path}  ({modified})")
 
-    for md_file in md_files[:limit]:
-        rel_path = md_file.relative_to(repo)
-        mtime = datetime.fromtimestamp(md_file.stat().st_mtime)
-        click.echo(f"  {rel_path}  ({mtime.strftime('%Y-%m-%d %H:%M')})")
+
+def _iter_markdown_files(root: Path) -> Iterator[tuple[float, str]]:
+    """Yield (mtime, path) for every markdown file under root.
+
+    Uses os.scandir so directory type checks come from the directory listing
+    and each file needs a single stat call.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        # Dangling symlink, or removed since the directory was listed
+                        continue
+                    yield mtime, entry.path
 
 
 @main.group()
@@ -296,6 +330,8 @@ def daemon(ctx: click.Context) -> None:
 @click.pass_context
 def daemon_start(ctx: click.Context, foreground: bool) -> None:
     """Start the sync daemon in background."""
+    from .daemon import get_daemon_status, start_daemon
+
     config: Config = ctx.obj["config"]
     status = get_daemon_status()
 
@@ -315,6 +351,8 @@ def daemon_start(ctx: click.Context, foreground: bool) -> None:
 @daemon.command(name="stop")
 def daemon_stop() -> None:
     """Stop the sync daemon."""
+    from .daemon import get_daemon_status, stop_daemon
+
     pid_path = get_pid_file_path()
     status = get_daemon_status(pid_path)
 
@@ -336,22 +374,16 @@ def daemon_stop() -> None:
 @daemon.command(name="status")
 def daemon_status_cmd() -> None:
     """Show daemon status."""
-    status = get_daemon_status()
-
-    if status.running:
-        click.echo(f"Daemon: running (PID: {status.pid})")
-    else:
-        click.echo("Daemon: not running")
+    from .daemon import get_daemon_status
 
-    if status.last_sync:
-        click.echo(f"Last sync: {status.last_sync.isoformat()}")
-    else:
-        click.echo("Last sync: never")
+    status = get_daemon_status()
 
-    if status.last_commit:
-        click.echo(f"Last commit: {status.last_commit.isoformat()}")
-    else:
-        click.echo("Last commit: never")
+    lines = [
+        f"Daemon: running (PID: {status.pid})" if status.running else "Daemon: not running",
+        f"Last sync: {status.last_sync.isoformat() if status.last_sync else 'never'}",
+        f"Last commit: {status.last_commit.isoformat() if status.last_commit else 'never'}",
+    ]
+    click.echo("\n".join(lines))
 
 
 @daemon.command(name="install")
@@ -359,14 +391,11 @@ def daemon_status_cmd() -> None:
 @click.pass_context
 def daemon_install(ctx: click.Context, user: bool) -> None:
     """Install daemon as system service (launchd/systemd)."""
-    import platform
-    import shutil
-
     config: Config = ctx.obj["config"]
-    system = platform.system()
+    system = _system()
 
     # Find ccjournal executable
-    ccjournal_path = shutil.which("ccjournal")
+    ccjournal_path = _which_ccjournal()
     if not ccjournal_path:
         click.echo("Warning: ccjournal not found in PATH, using default path", err=True)
         ccjournal_path = "/usr/local/bin/ccjournal"
@@ -380,8 +409,26 @@ def daemon_install(ctx: click.Context, user: bool) -> None:
         click.echo("Use 'ccjournal daemon start' or schedule with your task scheduler.")
 
 
+@functools.cache
+def _system() -> str:
+    """Return the OS name, as reported by platform.system()."""
+    import platform
+
+    return platform.system()
+
+
+@functools.cache
+def _which_ccjournal() -> str | None:
+    """Return the ccjournal executable found on PATH, if any."""
+    import shutil
+
+    return shutil.which("ccjournal")
+
+
 def _install_launchd(ccjournal_path: str, _config: Config, user: bool) -> None:
     """Install launchd service on macOS."""
+    from .daemon import generate_launchd_plist, get_default_log_path, get_launchd_plist_path
+
     plist_path = get_launchd_plist_path(user)
     log_path = get_default_log_path()
 
@@ -398,17 +445,22 @@ def _install_launchd(ccjournal_path: str, _config: Config, user: bool) -> None:
     plist_content = generate_launchd_plist(ccjournal_path, log_path)
     plist_path.write_text(plist_content)
 
-    click.echo(f"Created {plist_path}")
-    click.echo("")
-    click.echo("To start the service:")
-    click.echo(f"  launchctl load {plist_path}")
-    click.echo("")
-    click.echo("To stop the service:")
-    click.echo(f"  launchctl unload {plist_path}")
+    lines = [
+        f"Created {plist_path}",
+        "",
+        "To start the service:",
+        f"  launchctl load {plist_path}",
+        "",
+        "To stop the service:",
+        f"  launchctl unload {plist_path}",
+    ]
+    click.echo("\n".join(lines))
 
 
 def _install_systemd(ccjournal_path: str, _config: Config, user: bool) -> None:
     """Install systemd service on Linux."""
+    from .daemon import generate_systemd_service, get_default_log_path, get_systemd_service_path
+
     service_path = get_systemd_service_path(user)
     log_path = get_default_log_path()
 
@@ -425,31 +477,32 @@ def _install_systemd(ccjournal_path: str, _config: Config, user: bool) -> None:
     service_content = generate_systemd_service(ccjournal_path, log_path)
     service_path.write_text(service_content)
 
-    click.echo(f"Created {service_path}")
-    click.echo("")
-
+    lines = [f"Created {service_path}", "", "To enable and start the service:"]
     if user:
-        click.echo("To enable and start the service:")
-        click.echo("  systemctl --user daemon-reload")
-        click.echo("  systemctl --user enable ccjournal")
-        click.echo("  systemctl --user start ccjournal")
-        click.echo("")
-        click.echo("To check status:")
-        click.echo("  systemctl --user status ccjournal")
+        lines += [
+            "  systemctl --user daemon-reload",
+            "  systemctl --user enable ccjournal",
+            "  systemctl --user start ccjournal",
+            "",
+            "To check status:",
+            "  systemctl --user status ccjournal",
+        ]
     else:
-        click.echo("To enable and start the service:")
-        click.echo("  sudo systemctl daemon-reload")
-        click.echo("  sudo systemctl enable ccjournal")
-        click.echo("  sudo systemctl start ccjournal")
+        lines += [
+            "  sudo systemctl daemon-reload",
+            "  sudo systemctl enable ccjournal",
+            "  sudo systemctl start ccjournal",
+        ]
+    click.echo("\n".join(lines))
 
 
 @daemon.command(name="uninstall")
 @click.option("--user", is_flag=True, default=True, help="Uninstall user service (default)")
 def daemon_uninstall(user: bool) -> None:
     """Uninstall daemon service (launchd/systemd)."""
-    import platform
+    from .daemon import get_daemon_status, stop_daemon
 
-    system = platform.system()
+    system = _system()
 
     # Stop the daemon first
     pid_path = get_pid_file_path()
@@ -471,6 +524,8 @@ def daemon_uninstall(user: bool) -> None:
 
 def _uninstall_launchd(user: bool) -> None:
     """Uninstall launchd service on macOS."""
+    from .daemon import get_launchd_plist_path, uninstall_service
+
     plist_path = get_launchd_plist_path(user)
 
     if not plist_path.exists():
@@ -494,6 +549,8 @@ def _uninstall_launchd(user: bool) -> None:
 
 def _uninstall_systemd(user: bool) -> None:
     """Uninstall systemd service on Linux."""
+    from .daemon import get_systemd_service_path, uninstall_service
+
     service_path = get_systemd_service_path(user)
 
     if not service_path.exists():
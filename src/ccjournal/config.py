@@ -2,23 +2,73 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import hashlib
+import os
 import tomllib
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, date, datetime
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
+
+# Written at the top of saved config files, since tomli_w cannot emit inline comments.
+_CONFIG_HEADER = """\
+# ccjournal configuration
+#
+# Security: Set output.allow_public_repository to true only if you understand
+# the risks of pushing logs to a public repository.
+# Security: Set output.allow_unknown_visibility to true to allow pushing when
+# repository visibility cannot be determined (e.g., non-GitHub repositories or
+# when gh CLI is not available).
+#
+# [projects.aliases]
+# Project aliases (optional)
+# "/path/to/project" = "custom-name"
+
+"""
 
 
+@functools.cache
 def get_default_config_path() -> Path:
     """Get the default configuration file path."""
     return Path.home() / ".config" / "ccjournal" / "config.toml"
 
 
+@functools.cache
 def get_claude_projects_path() -> Path:
     """Get the Claude Code projects directory path."""
     return Path.home() / ".claude" / "projects"
 
 
+# Last parsed config file, keyed on its path and a digest of its contents.
+_config_data_cache: dict[tuple[str, bytes], dict[str, Any]] = {}
+
+
+def _parse_config_data(path: Path, raw: bytes) -> dict[str, Any]:
+    """Parse config file contents, reusing the last result if they are unchanged.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    key = (str(path), hashlib.blake2b(raw, digest_size=16).digest())
+    data = _config_data_cache.get(key)
+    if data is None:
+        data = tomllib.loads(raw.decode("utf-8"))
+        _config_data_cache.clear()
+        _config_data_cache[key] = data
+    return data
+
+
+# Last loaded Config per path, keyed on the file's (inode, mtime_ns, size).
+_loaded_config_cache: dict[Path, tuple[tuple[int, int, int], Config]] = {}
+
+
+def clear_config_cache() -> None:
+    """Drop the cached result of the last parsed config file."""
+    _config_data_cache.clear()
+    _loaded_config_cache.clear()
+
+
 @dataclass
 class OutputConfig:
     """Output configuration."""
@@ -54,15 +104,16 @@ class Config:
         """Load configuration from TOML file."""
         config_path = path or get_default_config_path()
 
-        if not config_path.exists():
+        try:
+            raw = config_path.read_bytes()
+        except FileNotFoundError:
             return cls()
 
-        with config_path.open("rb") as f:
-            data = tomllib.load(f)
+        data = _parse_config_data(config_path, raw)
 
         output_data = data.get("output", {})
         sync_data = data.get("sync", {})
-        aliases = data.get("projects", {}).get("aliases", {})
+        aliases = dict(data.get("projects", {}).get("aliases", {}))
 
         output = OutputConfig(
             repository=Path(output_data.get("repository", OutputConfig().repository)).expanduser(),
@@ -82,43 +133,99 @@ class Config:
 
         return cls(output=output, sync=sync, project_aliases=aliases)
 
+    @classmethod
+    def load_cached(cls, path: Path | None = None, missing_ok: bool = True) -> Config:
+        """Load configuration, reusing the last result while the file is unchanged.
+
+        Unlike load(), an unchanged file costs a single stat. The returned
+        Config is shared between callers and must not be mutated; use
+        clear_config_cache() to force the next call to read the file again.
+        A missing file gives the defaults, or raises FileNotFoundError if
+        missing_ok is False.
+        """
+        config_path = path or get_default_config_path()
+
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            _loaded_config_cache.pop(config_path, None)
+            if not missing_ok:
+                raise
+            return cls()
+
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = _loaded_config_cache.get(config_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        config = cls.load(config_path)
+        _loaded_config_cache[config_path] = (signature, config)
+        return config
+
     def save(self, path: Path | None = None) -> None:
         """Save configuration to TOML file."""
+        # Only needed when writing, which is rare compared to loading
+        import tomli_w
+
         config_path = path or get_default_config_path()
         config_path.parent.mkdir(parents=True, exist_ok=True)
 
-        content = f'''[output]
-repository = "{self.output.repository}"
-structure = "{self.output.structure}"
-remote = "{self.output.remote}"
-branch = "{self.output.branch}"
-auto_push = {str(self.output.auto_push).lower()}
-# Security: Set to true only if you understand the risks of pushing logs to a public repository
-allow_public_repository = {str(self.output.allow_public_repository).lower()}
-# Security: Set to true to allow pushing when repository visibility cannot be determined
-# (e.g., non-GitHub repositories or when gh CLI is not available)
-allow_unknown_visibility = {str(self.output.allow_unknown_visibility).lower()}
-
-[sync]
-interval = {self.sync.interval}
-exclude_system = {str(self.sync.exclude_system).lower()}
-exclude_tool_messages = {str(self.sync.exclude_tool_messages).lower()}
-
-[projects]
-# Project aliases (optional)
-# "/path/to/project" = "custom-name"
-'''
-        for original, alias in self.project_aliases.items():
-            content += f'"{original}" = "{alias}"\n'
+        output = asdict(self.output)
+        output["repository"] = str(self.output.repository)
+        data = {
+            "output": output,
+            "sync": asdict(self.sync),
+            "projects": {"aliases": self.project_aliases},
+        }
 
-        config_path.write_text(content)
+        config_path.write_bytes((_CONFIG_HEADER + tomli_w.dumps(data)).encode("utf-8"))
 
 
+@functools.cache
 def get_default_last_sync_path() -> Path:
     """Get the default last sync file path."""
     return Path.home() / ".config" / "ccjournal" / "last_sync"
 
 
+# Parent directories already created by _write_state_file in this process.
+_dirs_created: set[Path] = set()
+
+
+def _write_state_file(path: Path, content: str) -> None:
+    """Atomically replace a small state file with content.
+
+    The content is written to a uniquely named sibling temporary file and
+    renamed over path, so readers never observe a truncated file and
+    concurrent writers (e.g. a CLI sync during a daemon sync) never share one.
+    """
+    import tempfile
+
+    parent = path.parent
+    if parent not in _dirs_created:
+        parent.mkdir(parents=True, exist_ok=True)
+        _dirs_created.add(parent)
+
+    prefix = f"{path.name}."
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=parent, prefix=prefix, suffix=".tmp")
+    except FileNotFoundError:
+        # The directory was removed since it was first created
+        parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=parent, prefix=prefix, suffix=".tmp")
+    try:
+        try:
+            os.write(fd, content.encode("utf-8"))
+        finally:
+            os.close(fd)
+        # mkstemp creates files readable by the owner only
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
 def get_last_sync(path: Path | None = None) -> datetime | None:
     """Get the last sync timestamp.
 
@@ -130,9 +237,6 @@ def get_last_sync(path: Path | None = None) -> datetime | None:
     """
     last_sync_path = path or get_default_last_sync_path()
 
-    if not last_sync_path.exists():
-        return None
-
     try:
         content = last_sync_path.read_text().strip()
         return datetime.fromisoformat(content)
@@ -148,20 +252,21 @@ def save_last_sync(timestamp: datetime, path: Path | None = None) -> None:
         path: Path to the last sync file. If None, uses default path.
     """
     last_sync_path = path or get_default_last_sync_path()
-    last_sync_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Ensure timezone-aware datetime is saved in ISO format
     if timestamp.tzinfo is None:
         timestamp = timestamp.replace(tzinfo=UTC)
 
-    last_sync_path.write_text(timestamp.isoformat())
+    _write_state_file(last_sync_path, timestamp.isoformat())
 
 
+@functools.cache
 def get_pid_file_path() -> Path:
     """Get the default PID file path."""
     return Path.home() / ".config" / "ccjournal" / "ccjournal.pid"
 
 
+@functools.cache
 def get_last_commit_date_path() -> Path:
     """Get the default last commit date file path."""
     return Path.home() / ".config" / "ccjournal" / "last_commit"
@@ -178,9 +283,6 @@ def get_last_commit_date(path: Path | None = None) -> date | None:
     """
     last_commit_path = path or get_last_commit_date_path()
 
-    if not last_commit_path.exists():
-        return None
-
     try:
         content = last_commit_path.read_text().strip()
         return date.fromisoformat(content)
@@ -196,6 +298,5 @@ def save_last_commit_date(commit_date: date, path: Path | None = None) -> None:
         path: Path to the last commit file. If None, uses default path.
     """
     last_commit_path = path or get_last_commit_date_path()
-    last_commit_path.parent.mkdir(parents=True, exist_ok=True)
 
-    last_commit_path.write_text(commit_date.isoformat())
+    _write_state_file(last_commit_path, commit_date.isoformat())
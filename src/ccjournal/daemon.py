@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import os
+import select
 import signal
 import sys
 import time
@@ -17,6 +18,8 @@ if TYPE_CHECKING:
 
 from .config import (
     Config,
+    clear_config_cache,
+    get_default_config_path,
     get_last_commit_date,
     get_last_commit_date_path,
     get_last_sync,
@@ -39,7 +42,12 @@ def write_pid_file(path: Path, pid: int) -> None:
         pid: Process ID to write.
     """
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(str(pid))
+    # A raw fd write skips the text I/O layer for these few bytes
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, str(pid).encode())
+    finally:
+        os.close(fd)
 
 
 def read_pid_file(path: Path) -> int | None:
@@ -51,9 +59,6 @@ def read_pid_file(path: Path) -> int | None:
     Returns:
         Process ID if file exists and contains valid content, None otherwise.
     """
-    if not path.exists():
-        return None
-
     try:
         return int(path.read_text().strip())
     except (ValueError, OSError):
@@ -141,21 +146,63 @@ def stop_daemon(pid_file_path: Path | None = None, timeout: float = 5.0) -> bool
         return False
 
     os.kill(pid, signal.SIGTERM)
-
-    # Wait for process to stop
-    wait_time = 0.0
-    while wait_time < timeout and is_process_running(pid):
-        time.sleep(0.1)
-        wait_time += 0.1
+    _wait_for_exit(pid, timeout)
 
     return True
 
 
+def _wait_for_exit(pid: int, timeout: float) -> None:
+    """Wait until the process exits or timeout seconds have passed.
+
+    Uses a pidfd (Linux) or kqueue (macOS) so that the wait ends as soon as
+    the process exits, and falls back to polling every 100 ms otherwise.
+    """
+    if sys.platform == "linux" and hasattr(os, "pidfd_open"):
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return
+        except OSError:
+            pass  # e.g. kernel older than 5.3
+        else:
+            try:
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                poller.poll(timeout * 1000)
+            finally:
+                os.close(pidfd)
+            return
+
+    if sys.platform == "darwin":
+        kq = select.kqueue()
+        try:
+            event = select.kevent(
+                pid,
+                filter=select.KQ_FILTER_PROC,
+                flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                fflags=select.KQ_NOTE_EXIT,
+            )
+            kq.control([event], 1, timeout)
+            return
+        except ProcessLookupError:
+            return
+        except OSError:
+            pass
+        finally:
+            kq.close()
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and is_process_running(pid):
+        time.sleep(0.1)
+
+
 class DaemonProcess:
     """Daemon process for periodic sync.
 
     Attributes:
         config: Application configuration.
+        config_path: Config file re-checked before each sync, or None to keep
+            config fixed.
         pid_file_path: Path to store the PID file.
         last_commit_path: Path to store the last commit date.
         running: Whether the daemon is running.
@@ -167,6 +214,7 @@ class DaemonProcess:
         pid_file_path: Path | None = None,
         last_commit_path: Path | None = None,
         log_path: Path | None = None,
+        config_path: Path | None = None,
     ) -> None:
         """Initialize the daemon process.
 
@@ -175,12 +223,15 @@ class DaemonProcess:
             pid_file_path: Path to store the PID file.
             last_commit_path: Path to store the last commit date.
             log_path: Path to the log file.
+            config_path: Config file to reload from when it changes or on SIGHUP.
         """
         self.config = config
+        self.config_path = config_path
         self.pid_file_path = pid_file_path or get_pid_file_path()
         self.last_commit_path = last_commit_path or get_last_commit_date_path()
         self.log_path = log_path
         self.running = False
+        self._reload_requested = False
         self._logger: logging.Logger | None = None
 
     def _setup_logging(self) -> None:
@@ -213,8 +264,33 @@ class DaemonProcess:
             self._log(f"Received signal {signum}, stopping...")
             self.stop()
 
+        def reload_handler(_signum: int, _frame: FrameType | None) -> None:
+            self._reload_requested = True
+
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGHUP, reload_handler)
+
+    def _reload_config(self) -> None:
+        """Pick up changes to the config file, keeping the current config on error.
+
+        The file is only re-read when it has changed since the last load, or
+        when a reload was requested with SIGHUP.
+        """
+        if self.config_path is None:
+            return
+
+        if self._reload_requested:
+            self._reload_requested = False
+            self._log("Received SIGHUP, reloading configuration")
+            clear_config_cache()
+
+        # A missing file is usually mid-replace (an editor save or a dotfile
+        # sync); falling back to the defaults would sync to the wrong repository
+        try:
+            self.config = Config.load_cached(self.config_path, missing_ok=False)
+        except (OSError, ValueError) as e:
+            self._log(f"Failed to reload configuration: {e}", logging.ERROR)
 
     def should_commit(self) -> bool:
         """Check if a commit should be made.
@@ -255,15 +331,17 @@ class DaemonProcess:
 
     def _do_sync(self) -> None:
         """Perform a single sync cycle."""
+        self._reload_config()
+
         try:
             since = get_last_sync()
             if since:
                 self._log(f"Syncing files modified since {since.isoformat()}")
 
-            written_paths = sync_logs(self.config, since=since)
+            written_count = sum(1 for _ in sync_logs(self.config, since=since))
 
-            if written_paths:
-                self._log(f"Wrote {len(written_paths)} file(s)")
+            if written_count:
+                self._log(f"Wrote {written_count} file(s)")
                 save_last_sync(datetime.now(UTC))
 
                 # Commit once per day
@@ -291,6 +369,38 @@ class DaemonProcess:
         """Stop the daemon."""
         self.running = False
 
+    def _wait(self, timeout: float) -> None:
+        """Wait up to timeout seconds, returning early if the daemon is stopped.
+
+        SIGHUP also ends the wait early, so a reloaded config takes effect
+        with an immediate sync. On Linux the signals are blocked and collected
+        with sigtimedwait, so an idle daemon sleeps for the whole interval
+        without waking up. Elsewhere it sleeps in one-second steps and relies
+        on the signal handlers to set the flags.
+        """
+        if hasattr(signal, "sigtimedwait"):
+            signals = {signal.SIGTERM, signal.SIGINT, signal.SIGHUP}
+            previous_mask = signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+            try:
+                # Checked with the signals blocked, so none can slip in before the wait
+                if self.running and not self._reload_requested:
+                    info = signal.sigtimedwait(signals, timeout)
+                    if info is not None and info.si_signo == signal.SIGHUP:
+                        self._reload_requested = True
+                    elif info is not None:
+                        self._log(f"Received signal {info.si_signo}, stopping...")
+                        self.stop()
+            finally:
+                signal.pthread_sigmask(signal.SIG_SETMASK, previous_mask)
+            return
+
+        deadline = time.monotonic() + timeout
+        while self.running and not self._reload_requested:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(1, remaining))
+
     def run(self) -> None:
         """Run the daemon main loop."""
         self._setup_logging()
@@ -301,17 +411,11 @@ class DaemonProcess:
         self._log(f"Daemon started (PID: {os.getpid()})")
 
         self.running = True
-        interval = self.config.sync.interval
 
         try:
             while self.running:
                 self._do_sync()
-
-                # Sleep in small increments to allow for signal handling
-                sleep_time = 0
-                while sleep_time < interval and self.running:
-                    time.sleep(min(1, interval - sleep_time))
-                    sleep_time += 1
+                self._wait(self.config.sync.interval)
         finally:
             # Clean up PID file
             self.pid_file_path.unlink(missing_ok=True)
@@ -372,6 +476,7 @@ def start_daemon(config: Config, foreground: bool = False) -> bool:
         config=config,
         pid_file_path=pid_path,
         log_path=log_path if not foreground else None,
+        config_path=get_default_config_path(),
     )
     daemon.run()
 
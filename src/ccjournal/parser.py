@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-import json
+import contextlib
+import functools
+import os
 import re
 import subprocess
 from collections.abc import Iterator
@@ -10,8 +12,15 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+# orjson is an optional speedup (the "fast" extra); both accept bytes and raise
+# a ValueError subclass on malformed input.
+try:
+    from orjson import loads as _json_loads  # pyright: ignore[reportMissingImports]
+except ImportError:
+    from json import loads as _json_loads
 
-@dataclass
+
+@dataclass(slots=True)
 class Message:
     """A single message in a conversation."""
 
@@ -20,7 +29,7 @@ class Message:
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """A conversation session."""
 
@@ -62,19 +71,43 @@ def decode_project_path(encoded: str) -> Path:
     return _find_existing_path(parts, Path("/"))
 
 
+def _list_subdirectories(directory: Path) -> set[str] | None:
+    """Return the names of subdirectories of directory.
+
+    Returns an empty set if directory does not exist, or None if it exists but
+    cannot be listed (e.g. execute-only permissions).
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name for entry in it if entry.is_dir()}
+    except PermissionError:
+        return None
+    except OSError:
+        return set()
+
+
+def _has_subdirectory(directory: Path, subdirs: set[str] | None, name: str) -> bool:
+    """Check name against a listing from _list_subdirectories, or stat it if unlisted."""
+    if subdirs is None:
+        return (directory / name).is_dir()
+    return name in subdirs
+
+
 def _find_existing_path(parts: list[str], base: Path) -> Path:
     """Find the actual path by checking directory existence.
 
     Tries to reconstruct the original path by checking if directories exist.
     Tests longer segment combinations first (e.g., "claude-code-journal" before "claude").
+    Each directory on the way is listed once rather than probing every candidate.
     """
     if not parts:
         return base
 
-    result_parts: list[str] = []
+    current = base
     i = 0
 
     while i < len(parts):
+        subdirs = _list_subdirectories(current)
         best_segment: str | None = None
         best_end = i + 1
 
@@ -84,16 +117,14 @@ def _find_existing_path(parts: list[str], base: Path) -> Path:
 
             # Try joining with dots first (for domain names like github.com)
             candidate_dot = ".".join(segment_parts)
-            test_path_dot = base / "/".join(result_parts + [candidate_dot])
-            if test_path_dot.exists() and test_path_dot.is_dir():
+            if _has_subdirectory(current, subdirs, candidate_dot):
                 best_segment = candidate_dot
                 best_end = end
                 break
 
             # Try joining with dashes (for project names like claude-code-journal)
             candidate_dash = "-".join(segment_parts)
-            test_path_dash = base / "/".join(result_parts + [candidate_dash])
-            if test_path_dash.exists() and test_path_dash.is_dir():
+            if _has_subdirectory(current, subdirs, candidate_dash):
                 best_segment = candidate_dash
                 best_end = end
                 break
@@ -103,17 +134,38 @@ def _find_existing_path(parts: list[str], base: Path) -> Path:
             best_segment = parts[i]
             best_end = i + 1
 
-        result_parts.append(best_segment)
+        current = current / best_segment
         i = best_end
 
-    return base / "/".join(result_parts)
+    return current
 
 
-def get_git_remote_url(path: Path) -> str | None:
-    """Get the Git remote URL for a directory."""
+# Cached git metadata per directory, with the (mtime_ns, size) of the .git file
+# it was read from. Entries are reused until that file changes.
+_COMMIT_HASH_RE = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
+
+_remote_url_cache: dict[Path, tuple[tuple[int, int], str | None]] = {}
+_branch_cache: dict[Path, tuple[tuple[int, int], str | None]] = {}
+
+
+def _git_file_signature(path: Path, name: str) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) of path/.git/name, or None if it cannot be stat'ed.
+
+    None is returned for directories that are not repository roots (including
+    subdirectories and worktrees), whose metadata is then read without caching.
+    """
+    try:
+        stat = (path / ".git" / name).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _run_git_query(path: Path, *args: str) -> str | None:
+    """Run a read-only git command in path and return its stripped output."""
     try:
         result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
+            ["git", *args],
             cwd=path,
             capture_output=True,
             text=True,
@@ -126,23 +178,82 @@ def get_git_remote_url(path: Path) -> str | None:
     return None
 
 
-def get_git_branch(path: Path) -> str | None:
-    """Get the current Git branch for a directory."""
+def get_git_remote_url(path: Path) -> str | None:
+    """Get the Git remote URL for a directory."""
+    signature = _git_file_signature(path, "config")
+    cached = _remote_url_cache.get(path)
+    if signature is not None and cached is not None and cached[0] == signature:
+        return cached[1]
+
+    url = _run_git_query(path, "remote", "get-url", "origin")
+    if signature is not None:
+        _remote_url_cache[path] = (signature, url)
+    return url
+
+
+def _find_head_file(path: Path) -> tuple[Path, tuple[int, int]] | None:
+    """Locate the HEAD file of the repository rooted at path.
+
+    Handles both a .git directory and the .git file that linked worktrees and
+    submodules use to point at their git directory. Returns the HEAD path with
+    its (mtime_ns, size), or None if path is not a repository root.
+    """
+    head_file = path / ".git" / "HEAD"
     try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=path,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        pass
+        stat = head_file.stat()
+    except NotADirectoryError:
+        # .git is a file containing "gitdir: <path>"
+        try:
+            gitdir = (path / ".git").read_text(encoding="utf-8", errors="replace").strip()
+        except OSError:
+            return None
+        if not gitdir.startswith("gitdir: "):
+            return None
+        head_file = path / gitdir.removeprefix("gitdir: ") / "HEAD"
+        try:
+            stat = head_file.stat()
+        except OSError:
+            return None
+    except OSError:
+        return None
+    return head_file, (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_head_branch(head_file: Path) -> str | None:
+    """Read the current branch from a HEAD file without running git.
+
+    Returns "HEAD" for a detached HEAD, matching ``git rev-parse --abbrev-ref``,
+    or None if the file cannot be read or has an unexpected format.
+    """
+    try:
+        head = head_file.read_text(encoding="utf-8", errors="replace").strip()
+    except OSError:
+        return None
+    ref = head.removeprefix("ref: ")
+    if ref != head:
+        return ref.removeprefix("refs/heads/")
+    if _COMMIT_HASH_RE.fullmatch(head):
+        return "HEAD"
     return None
 
 
+def get_git_branch(path: Path) -> str | None:
+    """Get the current Git branch for a directory."""
+    head = _find_head_file(path)
+    signature = head[1] if head is not None else None
+    cached = _branch_cache.get(path)
+    if signature is not None and cached is not None and cached[0] == signature:
+        return cached[1]
+
+    branch = _read_head_branch(head[0]) if head is not None else None
+    if branch is None:
+        branch = _run_git_query(path, "rev-parse", "--abbrev-ref", "HEAD")
+    if signature is not None:
+        _branch_cache[path] = (signature, branch)
+    return branch
+
+
+@functools.lru_cache(maxsize=1024)
 def normalize_remote_url(url: str) -> str:
     """Normalize a Git remote URL to a consistent format.
 
@@ -152,23 +263,22 @@ def normalize_remote_url(url: str) -> str:
         ssh://git@github.com/user/repo.git -> github.com/user/repo
     """
     # Remove .git suffix
-    url = re.sub(r"\.git$", "", url)
-
-    # Handle SSH URLs in scp-like syntax (git@github.com:user/repo)
-    scp_match = re.match(r"git@([^:]+):(.+)", url)
-    if scp_match:
-        return f"{scp_match.group(1)}/{scp_match.group(2)}"
-
-    # Handle SSH URLs in URL syntax (ssh://git@github.com/user/repo)
-    ssh_url_match = re.match(r"ssh://git@([^/]+)/(.+)", url)
-    if ssh_url_match:
-        return f"{ssh_url_match.group(1)}/{ssh_url_match.group(2)}"
-
-    # Handle HTTPS URLs (https://github.com/user/repo)
-    https_match = re.match(r"https?://([^/]+)/(.+)", url)
-    if https_match:
-        return f"{https_match.group(1)}/{https_match.group(2)}"
-
+    url = url.removesuffix(".git")
+
+    if url.startswith("git@"):
+        # SSH URLs in scp-like syntax (git@github.com:user/repo)
+        host, _, repo = url[len("git@") :].partition(":")
+    elif url.startswith("ssh://git@"):
+        # SSH URLs in URL syntax (ssh://git@github.com/user/repo)
+        host, _, repo = url[len("ssh://git@") :].partition("/")
+    elif url.startswith(("https://", "http://")):
+        # HTTPS URLs (https://github.com/user/repo)
+        host, _, repo = url.partition("://")[2].partition("/")
+    else:
+        return url
+
+    if host and repo:
+        return f"{host}/{repo}"
     return url
 
 
@@ -183,24 +293,37 @@ def extract_project_name(path: Path) -> str:
     return f"_local-{path.name}"
 
 
+def _content_item_text(item: object) -> str | None:
+    """Return the text for one item of a content list, or None if it has none."""
+    if isinstance(item, dict):
+        item_type = item.get("type")
+        if item_type == "text":
+            return item.get("text", "")
+        if item_type == "tool_use":
+            return f"[Tool: {item.get('name', 'unknown')}]"
+        if item_type == "tool_result":
+            return "[Tool Result]"
+        return None
+    if isinstance(item, str):
+        return item
+    return None
+
+
 def extract_text_content(content: str | list | dict) -> str:
     """Extract text content from various message formats."""
     if isinstance(content, str):
         return content
 
     if isinstance(content, list):
+        # Most messages carry a single item; skip building a list to join
+        if len(content) == 1:
+            return _content_item_text(content[0]) or ""
+
         texts = []
         for item in content:
-            if isinstance(item, dict):
-                if item.get("type") == "text":
-                    texts.append(item.get("text", ""))
-                elif item.get("type") == "tool_use":
-                    tool_name = item.get("name", "unknown")
-                    texts.append(f"[Tool: {tool_name}]")
-                elif item.get("type") == "tool_result":
-                    texts.append("[Tool Result]")
-            elif isinstance(item, str):
-                texts.append(item)
+            text = _content_item_text(item)
+            if text is not None:
+                texts.append(text)
         return "\n".join(texts)
 
     # content is dict
@@ -209,15 +332,43 @@ def extract_text_content(content: str | list | dict) -> str:
     return str(content)
 
 
+_SYSTEM_TAG_RE = re.compile(r"</?(?:system-reminder|local-command-caveat)>")
+
+
 def is_system_message(content: str) -> bool:
     """Check if a message is a system message that should be excluded."""
-    patterns = [
-        r"<system-reminder>",
-        r"<local-command-caveat>",
-        r"</system-reminder>",
-        r"</local-command-caveat>",
-    ]
-    return any(re.search(pattern, content) for pattern in patterns)
+    # Most messages contain no tags at all
+    if "<" not in content:
+        return False
+    return _SYSTEM_TAG_RE.search(content) is not None
+
+
+def _extract_message_text(content: str | list | dict, exclude_system: bool) -> str | None:
+    """Extract text content, returning None for system messages.
+
+    Equivalent to ``extract_text_content`` followed by ``is_system_message``,
+    but checks each item while walking a content list so a system message is
+    rejected before the remaining items are collected and joined. System tags
+    never contain a newline, so a tag can't span the joined item boundaries.
+    """
+    if not exclude_system or not isinstance(content, list):
+        text = extract_text_content(content)
+        if exclude_system and is_system_message(text):
+            return None
+        return text
+
+    texts = []
+    for item in content:
+        text = _content_item_text(item)
+        if text is None:
+            continue
+        if is_system_message(text):
+            return None
+        texts.append(text)
+    return "\n".join(texts)
+
+
+_TOOL_USE_MARKER_RE = re.compile(r"\[Tool: [^\]]+\]")
 
 
 def is_tool_only_message(content: str) -> bool:
@@ -227,19 +378,16 @@ def is_tool_only_message(content: str) -> bool:
     Returns False if there's other text content.
     """
     # Remove all tool markers
-    cleaned = re.sub(r"\[Tool: [^\]]+\]", "", content)
-    cleaned = re.sub(r"\[Tool Result\]", "", cleaned)
+    cleaned = _TOOL_USE_MARKER_RE.sub("", content)
+    cleaned = cleaned.replace("[Tool Result]", "")
     # Check if anything meaningful remains
     return not cleaned.strip()
 
 
-def mask_sensitive_content(content: str) -> str:
-    """Mask potentially sensitive information in content.
-
-    Masks API keys, tokens, passwords, and other sensitive patterns.
-    """
-    # Common API key patterns
-    patterns = [
+# Common API key patterns
+_SENSITIVE_PATTERNS = [
+    (re.compile(pattern), replacement)
+    for pattern, replacement in [
         # Generic API keys/tokens (long alphanumeric strings that look like secrets)
         (r"(?i)(api[_-]?key|apikey|secret[_-]?key|access[_-]?token|auth[_-]?token)"
          r"\s*[=:]\s*['\"]?([a-zA-Z0-9_-]{20,})['\"]?",
@@ -267,53 +415,148 @@ def mask_sensitive_content(content: str) -> str:
          r"(\s*=\s*['\"]?)([^'\"\\n]{8,})(['\"]?)",
          r"\1\2\3***REDACTED***\5"),
     ]
+]
+
+
+def mask_sensitive_content(content: str) -> str:
+    """Mask potentially sensitive information in content.
 
-    for pattern, replacement in patterns:
-        content = re.sub(pattern, replacement, content)
+    Masks API keys, tokens, passwords, and other sensitive patterns.
+    """
+    for pattern, replacement in _SENSITIVE_PATTERNS:
+        content = pattern.sub(replacement, content)
 
     return content
 
 
+# Tags to extract content from (display the inner text)
+_EXTRACT_TAG_RES = [
+    re.compile(rf"<{tag}>(.*?)</{tag}>", flags=re.DOTALL)
+    for tag in ["command-name", "command-message", "command-args", "bash-input"]
+]
+
+# Tags to remove entirely (including content)
+_REMOVE_TAG_RES = [
+    re.compile(rf"<{tag}>.*?</{tag}>", flags=re.DOTALL)
+    for tag in ["bash-stdout", "bash-stderr", "local-command-stdout", "local-command-output"]
+]
+
+_EMPTY_TAG_RE = re.compile(r"<[^>]+></[^>]+>")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
 def clean_content(content: str) -> str:
     """Clean content by removing or transforming XML-like tags.
 
     Transforms tags like <bash-input>cmd</bash-input> to readable format
     and removes empty tags. Also masks sensitive information.
     """
-    # Tags to extract content from (display the inner text)
-    extract_tags = [
-        "command-name",
-        "command-message",
-        "command-args",
-        "bash-input",
-    ]
-    for tag in extract_tags:
-        # Replace <tag>content</tag> with just content
-        content = re.sub(rf"<{tag}>(.*?)</{tag}>", r"\1", content, flags=re.DOTALL)
-
-    # Tags to remove entirely (including content)
-    remove_tags = [
-        "bash-stdout",
-        "bash-stderr",
-        "local-command-stdout",
-        "local-command-output",
-    ]
-    for tag in remove_tags:
-        # Remove <tag>content</tag> entirely
-        content = re.sub(rf"<{tag}>.*?</{tag}>", "", content, flags=re.DOTALL)
+    # Tag patterns can only match content containing "<"
+    if "<" in content:
+        for pattern in _EXTRACT_TAG_RES:
+            # Replace <tag>content</tag> with just content
+            content = pattern.sub(r"\1", content)
 
-    # Remove any remaining empty XML-like tags
-    content = re.sub(r"<[^>]+></[^>]+>", "", content)
+        for pattern in _REMOVE_TAG_RES:
+            # Remove <tag>content</tag> entirely
+            content = pattern.sub("", content)
+
+        # Remove any remaining empty XML-like tags
+        content = _EMPTY_TAG_RE.sub("", content)
 
     # Mask sensitive information
     content = mask_sensitive_content(content)
 
     # Clean up multiple newlines
-    content = re.sub(r"\n{3,}", "\n\n", content)
+    content = _BLANK_LINES_RE.sub("\n\n", content)
 
     return content.strip()
 
 
+# Session files are often several megabytes; read them in large chunks
+_READ_BUFFER_SIZE = 1 << 20
+
+
+def _advise_sequential(fd: int, offset: int) -> None:
+    """Tell the kernel the file will be read sequentially from offset.
+
+    On Linux this widens readahead, so uncached session files are fetched in
+    larger asynchronous reads while earlier lines are being parsed.
+    """
+    if hasattr(os, "posix_fadvise"):
+        with contextlib.suppress(OSError):
+            os.posix_fadvise(fd, offset, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _date_prefix(date_filter: datetime | None) -> bytes | None:
+    """Return the ISO date that matching timestamps start with, as bytes."""
+    return date_filter.date().isoformat().encode() if date_filter else None
+
+
+def _parse_line(
+    line: bytes,
+    exclude_system: bool,
+    exclude_tool_messages: bool,
+    date_prefix: bytes | None,
+) -> Message | None:
+    """Parse one JSONL record into a Message, or None if it should be skipped.
+
+    date_prefix is the ``YYYY-MM-DD`` form of the date filter, compared against
+    the start of the timestamp so rejected records never build a datetime.
+    """
+    # Records of other types (summaries, snapshots, system events) and blank
+    # lines are skipped before paying for a full JSON parse.
+    if b'"user"' not in line and b'"assistant"' not in line:
+        return None
+
+    # A record from the filtered date has that date somewhere in the raw line.
+    # Lines without it are rejected unparsed; the timestamp check below is the
+    # exact one, since the date could also appear in the content.
+    if date_prefix and date_prefix not in line:
+        return None
+
+    try:
+        data = _json_loads(line)
+    except ValueError:
+        return None
+
+    msg_type = data.get("type")
+    if msg_type not in ("user", "assistant"):
+        return None
+
+    timestamp_str = data.get("timestamp")
+    if not timestamp_str:
+        return None
+
+    # Apply date filter
+    if date_prefix and timestamp_str[:10].encode() != date_prefix:
+        return None
+
+    try:
+        timestamp = datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        return None
+
+    # Extract content, dropping system messages as soon as one is seen
+    message_data = data.get("message", {})
+    content_raw = message_data.get("content", "")
+    content = _extract_message_text(content_raw, exclude_system)
+    if content is None:
+        return None
+
+    # Clean content (remove XML tags)
+    content = clean_content(content)
+
+    if not content.strip():
+        return None
+
+    # Exclude tool-only messages
+    if exclude_tool_messages and is_tool_only_message(content):
+        return None
+
+    return Message(type=msg_type, timestamp=timestamp, content=content)
+
+
 def parse_session_file(
     file_path: Path,
     exclude_system: bool = True,
@@ -331,51 +574,68 @@ def parse_session_file(
     Yields:
         Message objects
     """
-    with file_path.open() as f:
+    date_prefix = _date_prefix(date_filter)
+    with file_path.open("rb", buffering=_READ_BUFFER_SIZE) as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
+            message = _parse_line(line, exclude_system, exclude_tool_messages, date_prefix)
+            if message is not None:
+                yield message
 
-            try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
-                continue
 
-            msg_type = data.get("type")
-            if msg_type not in ("user", "assistant"):
-                continue
+@dataclass(slots=True)
+class SessionTail:
+    """Messages parsed from a session file starting at a byte offset.
 
-            timestamp_str = data.get("timestamp")
-            if not timestamp_str:
-                continue
-
-            try:
-                timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            except ValueError:
-                continue
+    Attributes:
+        messages: Messages from complete (newline-terminated) lines.
+        end_offset: Offset just past the last complete line; parsing can resume here.
+        pending: Message from a trailing line without a newline, which may still
+            be in the middle of being written and is therefore not covered by
+            end_offset.
+    """
 
-            # Apply date filter
-            if date_filter and timestamp.date() != date_filter.date():
-                continue
+    messages: list[Message]
+    end_offset: int
+    pending: Message | None = None
 
-            # Extract content
-            message_data = data.get("message", {})
-            content_raw = message_data.get("content", "")
-            content = extract_text_content(content_raw)
 
-            # Exclude system messages
-            if exclude_system and is_system_message(content):
-                continue
+def parse_session_tail(
+    file_path: Path,
+    start_offset: int = 0,
+    exclude_system: bool = True,
+    exclude_tool_messages: bool = True,
+    date_filter: datetime | None = None,
+) -> SessionTail:
+    """Parse a Claude Code session file from start_offset to the end.
 
-            # Clean content (remove XML tags)
-            content = clean_content(content)
+    Session files are append-only, so a caller that remembers end_offset can
+    later parse just the records appended since.
 
-            if not content.strip():
-                continue
+    Args:
+        file_path: Path to the session file
+        start_offset: Byte offset of the first line to parse
+        exclude_system: Whether to exclude system messages
+        exclude_tool_messages: Whether to exclude tool-only messages
+        date_filter: If provided, only include messages from this date
 
-            # Exclude tool-only messages
-            if exclude_tool_messages and is_tool_only_message(content):
-                continue
+    Returns:
+        SessionTail with the parsed messages and the offset to resume from
+    """
+    messages: list[Message] = []
+    pending: Message | None = None
+    offset = start_offset
+    date_prefix = _date_prefix(date_filter)
+
+    with file_path.open("rb", buffering=_READ_BUFFER_SIZE) as f:
+        _advise_sequential(f.fileno(), start_offset)
+        f.seek(start_offset)
+        for line in f:
+            message = _parse_line(line, exclude_system, exclude_tool_messages, date_prefix)
+            if not line.endswith(b"\n"):
+                pending = message
+                break
+            offset += len(line)
+            if message is not None:
+                messages.append(message)
 
-            yield Message(type=msg_type, timestamp=timestamp, content=content)
+    return SessionTail(messages=messages, end_offset=offset, pending=pending)
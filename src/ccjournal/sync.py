@@ -2,22 +2,40 @@
 
 from __future__ import annotations
 
+import io
+import multiprocessing
+import os
 import re
 import subprocess
+import sys
+import time
 from collections import defaultdict
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
+from itertools import repeat
+from multiprocessing.context import BaseContext
+from operator import itemgetter
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    import http.client
+
+    from _typeshed import SupportsWrite
 
 from .config import Config, get_claude_projects_path
 from .parser import (
     Message,
+    SessionTail,
     decode_project_path,
     extract_project_name,
     get_git_branch,
-    parse_session_file,
+    normalize_remote_url,
+    parse_session_tail,
 )
 
 
@@ -51,6 +69,43 @@ class PushPermissionResult:
     warning_message: str | None = None
 
 
+# How long a repository visibility lookup is reused before asking GitHub again.
+_VISIBILITY_CACHE_TTL = 300.0
+
+
+@dataclass
+class _VisibilityCacheEntry:
+    """Cached repository visibility and its expiry (time.monotonic() based)."""
+
+    visibility: RepositoryVisibility
+    expires: float
+
+
+_visibility_cache: dict[Path, _VisibilityCacheEntry] = {}
+
+
+def clear_visibility_cache() -> None:
+    """Forget all cached repository visibility lookups."""
+    _visibility_cache.clear()
+
+
+def _get_repository_visibility(repo_path: Path) -> RepositoryVisibility:
+    """Return the repository visibility, reusing a recent lookup for the same path.
+
+    Lookups are keyed on the resolved path, so relative paths and symlinks to
+    the same repository share one entry.
+    """
+    key = repo_path.resolve()
+    now = time.monotonic()
+    entry = _visibility_cache.get(key)
+    if entry is not None and entry.expires > now:
+        return entry.visibility
+
+    visibility = check_repository_visibility(repo_path)
+    _visibility_cache[key] = _VisibilityCacheEntry(visibility, now + _VISIBILITY_CACHE_TTL)
+    return visibility
+
+
 def check_push_permission(
     repo_path: Path,
     allow_public: bool,
@@ -66,9 +121,9 @@ def check_push_permission(
     Returns:
         PushPermissionResult with allowed status, visibility, and optional warning
     """
-    visibility = check_repository_visibility(repo_path)
+    visibility = _get_repository_visibility(repo_path)
 
-    if visibility == RepositoryVisibility.PUBLIC:
+    if visibility is RepositoryVisibility.PUBLIC:
         if not allow_public:
             return PushPermissionResult(
                 allowed=False,
@@ -87,7 +142,7 @@ def check_push_permission(
             ),
         )
 
-    if visibility == RepositoryVisibility.UNKNOWN:
+    if visibility is RepositoryVisibility.UNKNOWN:
         if not allow_unknown:
             return PushPermissionResult(
                 allowed=False,
@@ -107,21 +162,26 @@ def check_push_permission(
     return PushPermissionResult(allowed=True, visibility=visibility)
 
 
-def check_repository_visibility(repo_path: Path) -> RepositoryVisibility:
+def check_repository_visibility(
+    repo_path: Path,
+    runner: Callable[..., subprocess.CompletedProcess[str]] = subprocess.run,
+) -> RepositoryVisibility:
     """Check if a repository is public or private.
 
-    Uses GitHub CLI (gh) to determine repository visibility.
+    Uses the GitHub API directly when a token is set in GITHUB_TOKEN or
+    GH_TOKEN, and GitHub CLI (gh) otherwise or if the API request fails.
     Only works for GitHub repositories.
 
     Args:
         repo_path: Path to the Git repository
+        runner: Runs the git and gh commands, with subprocess.run's signature
 
     Returns:
         RepositoryVisibility indicating public, private, or unknown
     """
     # Get remote URL
     try:
-        result = subprocess.run(
+        result = runner(
             ["git", "remote", "get-url", "origin"],
             cwd=repo_path,
             capture_output=True,
@@ -138,9 +198,13 @@ def check_repository_visibility(repo_path: Path) -> RepositoryVisibility:
     if not _is_github_url(remote_url):
         return RepositoryVisibility.UNKNOWN
 
+    visibility = _github_api_visibility(remote_url)
+    if visibility is not None:
+        return visibility
+
     # Use gh CLI to check visibility
     try:
-        result = subprocess.run(
+        result = runner(
             ["gh", "repo", "view", "--json", "isPrivate", "--jq", ".isPrivate"],
             cwd=repo_path,
             capture_output=True,
@@ -157,15 +221,85 @@ def check_repository_visibility(repo_path: Path) -> RepositoryVisibility:
         return RepositoryVisibility.UNKNOWN
 
 
+# Kept open between visibility checks so repeated lookups reuse one TLS session
+_github_connection: http.client.HTTPSConnection | None = None
+
+
+def _github_api_visibility(remote_url: str) -> RepositoryVisibility | None:
+    """Look up repository visibility with the GitHub REST API.
+
+    Returns None when no token is set in the environment or the request does
+    not give a definite answer, so the caller can fall back to gh.
+    """
+    global _github_connection
+
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+    if not token:
+        return None
+
+    host, _, repo = normalize_remote_url(remote_url).partition("/")
+    if host != "github.com" or repo.count("/") != 1:
+        return None
+
+    import http.client
+    import json
+
+    reused = _github_connection is not None
+    connection = _github_connection or http.client.HTTPSConnection("api.github.com", timeout=10)
+    _github_connection = connection
+    try:
+        try:
+            status, body = _github_get(connection, f"/repos/{repo}", token)
+        except (ConnectionError, http.client.BadStatusLine):
+            if not reused:
+                raise
+            # GitHub closes idle keep-alive sockets well before the next lookup
+            # is due, so retry once on a fresh connection
+            connection.close()
+            connection = http.client.HTTPSConnection("api.github.com", timeout=10)
+            _github_connection = connection
+            status, body = _github_get(connection, f"/repos/{repo}", token)
+        if status != 200:
+            return None
+        data = json.loads(body)
+    except (OSError, http.client.HTTPException, ValueError):
+        connection.close()
+        _github_connection = None
+        return None
+
+    is_private = data.get("private") if isinstance(data, dict) else None
+    if not isinstance(is_private, bool):
+        return None
+    return RepositoryVisibility.PRIVATE if is_private else RepositoryVisibility.PUBLIC
+
+
+def _github_get(
+    connection: http.client.HTTPSConnection, path: str, token: str
+) -> tuple[int, bytes]:
+    """Send an authenticated GET request to the GitHub API and read the response."""
+    connection.request(
+        "GET",
+        path,
+        headers={
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {token}",
+            "User-Agent": "ccjournal",
+        },
+    )
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+# Matches github.com: (SSH) or github.com/ (HTTPS)
+_GITHUB_URL_RE = re.compile(r"github\.com[:/]")
+
+
 def _is_github_url(url: str) -> bool:
     """Check if a URL is a GitHub repository URL."""
-    patterns = [
-        r"github\.com[:/]",  # Matches github.com: (SSH) or github.com/ (HTTPS)
-    ]
-    return any(re.search(pattern, url) for pattern in patterns)
+    return _GITHUB_URL_RE.search(url) is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectSession:
     """A session with project metadata."""
 
@@ -176,6 +310,42 @@ class ProjectSession:
     messages: list[Message]
 
 
+# Below this many project directories, discovery runs on the calling thread.
+_PARALLEL_DISCOVERY_THRESHOLD = 8
+
+
+def _discover_project_sessions(
+    project_dir: Path,
+    since_ts: float | None,
+) -> list[tuple[Path, str, Path]]:
+    """Find the session files in one project directory.
+
+    Args:
+        project_dir: Project directory to scan.
+        since_ts: If provided, only include files modified after this POSIX timestamp.
+    """
+    project_path = decode_project_path(project_dir.name)
+    sessions = []
+
+    try:
+        with os.scandir(project_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".jsonl") or not entry.is_file():
+                    continue
+
+                # Filter by modification time if since is provided
+                if since_ts is not None and entry.stat().st_mtime <= since_ts:
+                    continue
+
+                session_file = Path(entry.path)
+                sessions.append((session_file, session_file.stem, project_path))
+    except OSError:
+        # Unreadable, or removed since the projects directory was listed
+        return []
+
+    return sessions
+
+
 def discover_sessions(
     claude_projects_path: Path | None = None,
     since: datetime | None = None,
@@ -191,26 +361,243 @@ def discover_sessions(
     """
     projects_path = claude_projects_path or get_claude_projects_path()
 
-    if not projects_path.exists():
+    # scandir reports entry types from the directory listing, so telling project
+    # directories apart needs no extra stat per entry
+    try:
+        with os.scandir(projects_path) as it:
+            project_dirs = [Path(entry.path) for entry in it if entry.is_dir()]
+    except (FileNotFoundError, NotADirectoryError):
         return
 
-    for project_dir in projects_path.iterdir():
-        if not project_dir.is_dir():
+    # Compared against raw st_mtime values, skipping a datetime per file
+    since_ts = since.timestamp() if since is not None else None
+
+    if len(project_dirs) < _PARALLEL_DISCOVERY_THRESHOLD:
+        for project_dir in project_dirs:
+            yield from _discover_project_sessions(project_dir, since_ts)
+        return
+
+    # Listing, stat'ing and decoding each project is syscall-bound, so threads
+    # overlap the latency; map keeps the results in directory order
+    workers = min(32, (os.cpu_count() or 1) * 4, len(project_dirs))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for project_sessions in executor.map(
+            _discover_project_sessions, project_dirs, repeat(since_ts)
+        ):
+            yield from project_sessions
+
+
+# Below this many files, the cost of starting worker processes outweighs parsing in parallel.
+_PARALLEL_PARSE_THRESHOLD = 8
+
+
+@dataclass
+class _ParseCacheEntry:
+    """Messages parsed from a session file, and the file state they reflect."""
+
+    options: tuple[bool, bool, datetime | None]
+    inode: int
+    mtime_ns: int
+    size: int
+    tail: SessionTail
+
+
+# Session files parsed by the previous collect_sessions call. Claude Code only
+# appends to session files, so a file that grew is parsed from tail.end_offset.
+_parse_cache: dict[Path, _ParseCacheEntry] = {}
+
+
+def _pool_context() -> BaseContext | None:
+    """Return the multiprocessing context for parse workers.
+
+    Forked workers start without re-importing ccjournal, which is much cheaper
+    than spawning fresh interpreters. Only Linux uses fork: on macOS forking
+    is unsafe with system frameworks loaded, so the platform default is kept.
+    """
+    if sys.platform == "linux":
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def _parse_in_process_pool(
+    workers: int,
+    session_files: list[Path],
+    start_offsets: list[int],
+    exclude_system: bool,
+    exclude_tool_messages: bool,
+    date_filter: datetime | None,
+) -> list[SessionTail] | None:
+    """Parse session files on a process pool.
+
+    Returns None if the pool could not be started or its workers died, so the
+    caller can parse serially. Errors raised while parsing a file propagate.
+    """
+    try:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+    except OSError:
+        # Process pools are unavailable in some sandboxes
+        return None
+
+    with executor:
+        try:
+            # map submits every chunk up front, starting the workers here, so an
+            # OSError at this point comes from the pool rather than from parsing
+            results = executor.map(
+                parse_session_tail,
+                session_files,
+                start_offsets,
+                repeat(exclude_system),
+                repeat(exclude_tool_messages),
+                repeat(date_filter),
+                chunksize=max(1, len(session_files) // (4 * workers)),
+            )
+        except (OSError, BrokenProcessPool):
+            return None
+        try:
+            return list(results)
+        except BrokenProcessPool:
+            return None
+
+
+def _parse_session_tails(
+    session_files: list[Path],
+    start_offsets: list[int],
+    exclude_system: bool,
+    exclude_tool_messages: bool,
+    date_filter: datetime | None,
+) -> list[SessionTail]:
+    """Parse session files from the given offsets, in worker processes when there are many."""
+    workers = min(os.cpu_count() or 1, len(session_files))
+    if len(session_files) >= _PARALLEL_PARSE_THRESHOLD and workers > 1:
+        tails = _parse_in_process_pool(
+            workers,
+            session_files,
+            start_offsets,
+            exclude_system,
+            exclude_tool_messages,
+            date_filter,
+        )
+        if tails is not None:
+            return tails
+
+    return [
+        parse_session_tail(f, offset, exclude_system, exclude_tool_messages, date_filter)
+        for f, offset in zip(session_files, start_offsets, strict=True)
+    ]
+
+
+def _parse_session_files(
+    session_files: list[Path],
+    exclude_system: bool,
+    exclude_tool_messages: bool,
+    date_filter: datetime | None,
+) -> list[list[Message]]:
+    """Parse session files, reusing results from the previous call where possible.
+
+    Unchanged files are not read again, and files that grew are parsed only from
+    where the previous parse stopped.
+
+    Returns:
+        The messages of each file, in the same order as session_files.
+    """
+    options = (exclude_system, exclude_tool_messages, date_filter)
+    cache: dict[Path, _ParseCacheEntry] = {}
+    results: list[SessionTail | None] = [None] * len(session_files)
+    stats: dict[int, os.stat_result] = {}
+    resumed: dict[int, SessionTail] = {}
+    to_parse: list[int] = []
+
+    for i, session_file in enumerate(session_files):
+        entry = _parse_cache.get(session_file)
+        try:
+            stat = session_file.stat()
+        except OSError:
+            # Let the parse below report the error
+            to_parse.append(i)
             continue
+        stats[i] = stat
+
+        if entry is not None and entry.options == options and entry.inode == stat.st_ino:
+            if (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                cache[session_file] = entry
+                results[i] = entry.tail
+                continue
+            if stat.st_size >= entry.size:
+                resumed[i] = entry.tail
+        to_parse.append(i)
+
+    tails = _parse_session_tails(
+        [session_files[i] for i in to_parse],
+        [resumed[i].end_offset if i in resumed else 0 for i in to_parse],
+        exclude_system,
+        exclude_tool_messages,
+        date_filter,
+    )
 
-        project_path = decode_project_path(project_dir.name)
+    for i, tail in zip(to_parse, tails, strict=True):
+        if i in resumed:
+            tail = SessionTail(resumed[i].messages + tail.messages, tail.end_offset, tail.pending)
+        results[i] = tail
+        if i in stats:
+            stat = stats[i]
+            cache[session_files[i]] = _ParseCacheEntry(
+                options, stat.st_ino, stat.st_mtime_ns, stat.st_size, tail
+            )
 
-        for session_file in project_dir.glob("*.jsonl"):
-            # Filter by modification time if since is provided
-            if since is not None:
-                mtime = datetime.fromtimestamp(
-                    session_file.stat().st_mtime, tz=since.tzinfo
-                )
-                if mtime <= since:
-                    continue
+    # Keep only the files seen in this call, so sessions that went idle are dropped
+    _parse_cache.clear()
+    _parse_cache.update(cache)
 
-            session_id = session_file.stem
-            yield session_file, session_id, project_path
+    return [
+        [*tail.messages, *([tail.pending] if tail.pending else [])]
+        for tail in results
+        if tail is not None
+    ]
+
+
+def _iter_project_sessions(
+    config: Config,
+    date_filter: datetime | None,
+    since: datetime | None,
+) -> Iterator[ProjectSession]:
+    """Parse discovered session files and yield the sessions that have messages."""
+    discovered = list(discover_sessions(since=since))
+    parsed = _parse_session_files(
+        [session_file for session_file, _, _ in discovered],
+        exclude_system=config.sync.exclude_system,
+        exclude_tool_messages=config.sync.exclude_tool_messages,
+        date_filter=date_filter,
+    )
+
+    aliases = config.project_aliases
+    # Sessions of one project share its name and branch, so look them up once
+    project_info: dict[Path, tuple[str, str | None]] = {}
+
+    for (_, session_id, project_path), messages in zip(discovered, parsed, strict=True):
+        if not messages:
+            continue
+
+        info = project_info.get(project_path)
+        if info is None:
+            # Get project name (use alias if defined)
+            project_name = aliases.get(str(project_path)) if aliases else None
+            if project_name is None:
+                project_name = extract_project_name(project_path)
+
+            # Get branch info
+            branch = get_git_branch(project_path) if project_path.exists() else None
+
+            info = project_info[project_path] = (project_name, branch)
+
+        project_name, branch = info
+
+        yield ProjectSession(
+            session_id=session_id,
+            project_name=project_name,
+            project_path=project_path,
+            branch=branch,
+            messages=messages,
+        )
 
 
 def collect_sessions(
@@ -228,59 +615,76 @@ def collect_sessions(
     Returns:
         List of ProjectSession objects
     """
-    sessions = []
+    return list(_iter_project_sessions(config, date_filter, since))
 
-    for session_file, session_id, project_path in discover_sessions(since=since):
-        messages = list(
-            parse_session_file(
-                session_file,
-                exclude_system=config.sync.exclude_system,
-                exclude_tool_messages=config.sync.exclude_tool_messages,
-                date_filter=date_filter,
-            )
-        )
 
-        if not messages:
-            continue
+def collect_sessions_grouped(
+    config: Config,
+    date_filter: datetime | None = None,
+    since: datetime | None = None,
+) -> dict[tuple[str, date], list[ProjectSession]]:
+    """Collect sessions grouped by the output file they belong to.
 
-        # Get project name (use alias if defined)
-        project_name = config.project_aliases.get(
-            str(project_path),
-            extract_project_name(project_path),
-        )
+    Sessions that span multiple days are split by message date as they are
+    collected, so the sessions are walked only once.
 
-        # Get branch info
-        branch = get_git_branch(project_path) if project_path.exists() else None
+    Args:
+        config: Application configuration
+        date_filter: If provided, only include messages from this date
+        since: If provided, only include sessions from files modified after this timestamp
 
-        sessions.append(
-            ProjectSession(
-                session_id=session_id,
-                project_name=project_name,
-                project_path=project_path,
-                branch=branch,
+    Returns:
+        Dictionary mapping (project_name, date) to that day's sessions, sorted by start time
+    """
+    # Each entry carries its start time so groups sort on a precomputed key
+    grouped: dict[tuple[str, date], list[tuple[datetime, ProjectSession]]] = defaultdict(list)
+    for session in _iter_project_sessions(config, date_filter, since):
+        # Keyed on date(), which is cheaper to build and hash than a midnight datetime
+        day_messages: dict[date, list[Message]] = defaultdict(list)
+        for msg in session.messages:
+            day_messages[msg.timestamp.date()].append(msg)
+
+        for day, messages in day_messages.items():
+            split_session = ProjectSession(
+                session_id=session.session_id,
+                project_name=session.project_name,
+                project_path=session.project_path,
+                branch=session.branch,
                 messages=messages,
             )
-        )
+            grouped[(session.project_name, day)].append((messages[0].timestamp, split_session))
+
+    result: dict[tuple[str, date], list[ProjectSession]] = {}
+    for key, entries in grouped.items():
+        entries.sort(key=itemgetter(0))
+        result[key] = [session for _, session in entries]
+    return result
 
-    return sessions
+
+def _format_date(date: date) -> str:
+    """Format a date as YYYY-MM-DD without going through strftime."""
+    return f"{date.year:04d}-{date.month:02d}-{date.day:02d}"
 
 
 def format_message_markdown(msg: Message) -> str:
     """Format a message as Markdown."""
-    timestamp_str = msg.timestamp.strftime("%H:%M:%S")
+    # Formatted from the fields directly; strftime is several times slower
+    ts = msg.timestamp
+    timestamp_str = f"{ts.hour:02d}:{ts.minute:02d}:{ts.second:02d}"
     role = "User" if msg.type == "user" else "Assistant"
     return f"### {timestamp_str} {role}\n\n{msg.content}\n"
 
 
-def format_session_markdown(session: ProjectSession) -> str:
-    """Format a session as Markdown."""
-    if not session.messages:
-        return ""
+def write_session_markdown(session: ProjectSession, fp: SupportsWrite[str]) -> None:
+    """Write a session as Markdown to fp, one piece at a time.
 
+    The session must have at least one message; collect_sessions and
+    split_session_by_date never produce empty sessions.
+    """
     start_ts = session.messages[0].timestamp
     end_ts = session.messages[-1].timestamp
-    start_time = start_ts.strftime("%H:%M")
-    end_time = end_ts.strftime("%H:%M")
+    start_time = f"{start_ts.hour:02d}:{start_ts.minute:02d}"
+    end_time = f"{end_ts.hour:02d}:{end_ts.minute:02d}"
 
     # Calculate day difference for sessions spanning multiple days
     day_diff = (end_ts.date() - start_ts.date()).days
@@ -288,27 +692,58 @@ def format_session_markdown(session: ProjectSession) -> str:
     if day_diff > 0:
         time_range += f" (+{day_diff})"
 
-    lines = [
-        f"## Session: {session.session_id[:8]} ({time_range})",
-    ]
+    fp.write(f"## Session: {session.session_id[:8]} ({time_range})\n")
 
     # Add metadata
     metadata = []
     if session.branch:
         metadata.append(f"**Branch:** {session.branch}")
     metadata.append(f"**Path:** {session.project_path}")
-    if metadata:
-        lines.append(" | ".join(metadata))
-
-    lines.append("")
+    fp.write(" | ".join(metadata) + "\n\n")
 
     # Add messages
     for msg in session.messages:
-        lines.append(format_message_markdown(msg))
+        fp.write(format_message_markdown(msg))
+        fp.write("\n")
 
-    lines.append("---\n")
+    fp.write("---\n")
 
-    return "\n".join(lines)
+
+def format_session_markdown(session: ProjectSession) -> str:
+    """Format a non-empty session as Markdown."""
+    buffer = io.StringIO()
+    write_session_markdown(session, buffer)
+    return buffer.getvalue()
+
+
+class _UpdatingWriter:
+    """Write text over an existing file, skipping bytes that are already there.
+
+    Output is compared with the file as it is produced. Writing starts at the
+    first byte that differs, so an unchanged file is never written and a file
+    that only grew at the end has just the new tail written.
+    """
+
+    def __init__(self, f: BinaryIO, compare: bool) -> None:
+        self._f = f
+        self._comparing = compare
+        self._pos = 0
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        if self._comparing:
+            if self._f.read(len(data)) == data:
+                self._pos += len(data)
+                return
+            self._comparing = False
+            self._f.seek(self._pos)
+        self._f.write(data)
+        self._pos += len(data)
+
+    def finish(self) -> None:
+        """Drop any existing content beyond what was written."""
+        if not self._comparing or self._f.read(1):
+            self._f.truncate(self._pos)
 
 
 def split_session_by_date(session: ProjectSession) -> dict[datetime, ProjectSession]:
@@ -346,10 +781,14 @@ def split_session_by_date(session: ProjectSession) -> dict[datetime, ProjectSess
     return result
 
 
+# Path separators replaced in project names used as file or directory names
+_SAFE_NAME_TABLE = str.maketrans({"/": "-", "\\": "-"})
+
+
 def generate_output_path(
     config: Config,
     project_name: str,
-    date: datetime,
+    date: date,
 ) -> Path:
     """Generate the output file path based on configuration.
 
@@ -364,7 +803,7 @@ def generate_output_path(
     repo_path = config.output.repository
 
     # Sanitize project name for filesystem
-    safe_project_name = project_name.replace("/", "-").replace("\\", "-")
+    safe_project_name = project_name.translate(_SAFE_NAME_TABLE)
 
     if config.output.structure == "date":
         # Date-based: YYYY/MM/DD/project-name.md
@@ -377,31 +816,39 @@ def generate_output_path(
         )
     else:
         # Project-based: project-name/YYYY-MM-DD.md
-        return repo_path / safe_project_name / f"{date.strftime('%Y-%m-%d')}.md"
+        return repo_path / safe_project_name / f"{_format_date(date)}.md"
+
+
+_WRITE_BUFFER_SIZE = 1 << 20
 
 
 def write_markdown_file(
     path: Path,
     project_name: str,
-    date: datetime,
+    date: date,
     sessions: list[ProjectSession],
 ) -> None:
-    """Write sessions to a Markdown file."""
-    path.parent.mkdir(parents=True, exist_ok=True)
+    """Write sessions to a Markdown file, in the order given.
 
-    date_str = date.strftime("%Y-%m-%d")
-    lines = [f"# {project_name} - {date_str}\n\n"]
-
-    # Sort sessions by start time
-    sorted_sessions = sorted(
-        sessions,
-        key=lambda s: s.messages[0].timestamp if s.messages else datetime.min,
-    )
-
-    for session in sorted_sessions:
-        lines.append(format_session_markdown(session))
+    Output is streamed to the file rather than assembled in memory. Bytes
+    that already match the existing file are not rewritten; an unchanged file
+    is left untouched, which also keeps git from re-hashing it on the next
+    status.
+    """
+    try:
+        f = path.open("r+b", buffering=_WRITE_BUFFER_SIZE)
+        compare = True
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = path.open("wb", buffering=_WRITE_BUFFER_SIZE)
+        compare = False
 
-    path.write_text("".join(lines))
+    with f:
+        writer = _UpdatingWriter(f, compare)
+        writer.write(f"# {project_name} - {_format_date(date)}\n\n")
+        for session in sessions:
+            write_session_markdown(session, writer)
+        writer.finish()
 
 
 def sync_logs(
@@ -409,7 +856,7 @@ def sync_logs(
     date_filter: datetime | None = None,
     dry_run: bool = False,
     since: datetime | None = None,
-) -> list[Path]:
+) -> Iterator[Path]:
     """Sync conversation logs to the output repository.
 
     Args:
@@ -418,31 +865,27 @@ def sync_logs(
         dry_run: If True, don't actually write files
         since: If provided, only sync files modified after this timestamp
 
-    Returns:
-        List of paths that were written (or would be written in dry run)
+    Yields:
+        Paths as they are written (or would be written in dry run)
     """
-    sessions = collect_sessions(config, date_filter, since=since)
+    grouped = collect_sessions_grouped(config, date_filter, since=since)
 
-    if not sessions:
-        return []
+    for (project_name, day), project_sessions in grouped.items():
+        output_path = generate_output_path(config, project_name, day)
 
-    # Group sessions by (project_name, date), splitting sessions that span multiple days
-    grouped: dict[tuple[str, datetime], list[ProjectSession]] = defaultdict(list)
-    for session in sessions:
-        split_sessions = split_session_by_date(session)
-        for date, split_session in split_sessions.items():
-            grouped[(session.project_name, date)].append(split_session)
+        if not dry_run:
+            write_markdown_file(output_path, project_name, day, project_sessions)
 
-    written_paths = []
-    for (project_name, date), project_sessions in grouped.items():
-        output_path = generate_output_path(config, project_name, date)
+        yield output_path
 
-        if not dry_run:
-            write_markdown_file(output_path, project_name, date, project_sessions)
 
-        written_paths.append(output_path)
+# Stages everything and commits it with the message passed as $1. Checking the
+# index with diff --quiet replaces a separate status call, and running the
+# steps in one shell saves launching a process for each of them.
+_COMMIT_SCRIPT = 'git add -A && { git diff --cached --quiet && exit 100; git commit -m "$1"; }'
 
-    return written_paths
+# Exit status of _COMMIT_SCRIPT when there is nothing to commit
+_NOTHING_TO_COMMIT = 100
 
 
 def git_commit_and_push(
@@ -463,33 +906,18 @@ def git_commit_and_push(
         True if successful, False otherwise
     """
     try:
-        # Check if there are changes
+        # Add, check for staged changes and commit in a single shell
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         result = subprocess.run(
-            ["git", "status", "--porcelain"],
+            ["sh", "-c", _COMMIT_SCRIPT, "sh", f"Update conversation logs ({timestamp})"],
             cwd=repo_path,
-            capture_output=True,
             text=True,
-            timeout=10,
+            timeout=50,
         )
-        if not result.stdout.strip():
+        if result.returncode == _NOTHING_TO_COMMIT:
             return True  # No changes to commit
-
-        # Add all changes
-        subprocess.run(
-            ["git", "add", "-A"],
-            cwd=repo_path,
-            check=True,
-            timeout=10,
-        )
-
-        # Commit
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        subprocess.run(
-            ["git", "commit", "-m", f"Update conversation logs ({timestamp})"],
-            cwd=repo_path,
-            check=True,
-            timeout=30,
-        )
+        if result.returncode != 0:
+            return False
 
         # Push
         if auto_push:
@@ -0,0 +1,52 @@
+"""Shared fixtures for the test suite."""
+
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from ccjournal.parser import Message
+from ccjournal.sync import ProjectSession, clear_visibility_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_visibility_cache() -> None:
+    """Start every test without repository visibility lookups cached by earlier ones."""
+    clear_visibility_cache()
+
+
+@pytest.fixture(scope="session")
+def make_message() -> Callable[..., Message]:
+    """Factory for messages, defaulting to user messages."""
+
+    def _make(timestamp: datetime, content: str, type: str = "user") -> Message:
+        return Message(type=type, timestamp=timestamp, content=content)
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def make_session() -> Callable[..., ProjectSession]:
+    """Factory for sessions of the sample project holding the given messages."""
+
+    def _make(
+        messages: list[Message],
+        branch: str | None = "main",
+        session_id: str = "abc12345",
+    ) -> ProjectSession:
+        return ProjectSession(
+            session_id=session_id,
+            project_name="my-project",
+            project_path=Path("/path/to/project"),
+            branch=branch,
+            messages=messages,
+        )
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def shared_output_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Output directory shared by the filesystem tests of the whole session."""
+    return tmp_path_factory.mktemp("ccjournal_out")
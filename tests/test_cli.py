@@ -0,0 +1,29 @@
+"""Tests for the cli module."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from ccjournal.cli import _iter_markdown_files
+
+
+class TestIterMarkdownFiles:
+    """Tests for _iter_markdown_files function."""
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="symlinks need extra privileges")
+    def test_broken_symlink_does_not_hide_other_files(self, tmp_path: Path) -> None:
+        """A dangling .md symlink should be skipped without ending the listing."""
+        (tmp_path / "2024" / "01").mkdir(parents=True)
+        (tmp_path / "a.md").write_text("# a")
+        (tmp_path / "z.md").write_text("# z")
+        (tmp_path / "2024" / "01" / "b.md").write_text("# b")
+        (tmp_path / "broken.md").symlink_to(tmp_path / "missing.md")
+
+        found = sorted(path for _, path in _iter_markdown_files(tmp_path))
+
+        assert found == [
+            str(tmp_path / "2024" / "01" / "b.md"),
+            str(tmp_path / "a.md"),
+            str(tmp_path / "z.md"),
+        ]
@@ -2,9 +2,13 @@
 
 from datetime import UTC, date, datetime
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 from ccjournal.config import (
     Config,
+    clear_config_cache,
     get_last_commit_date,
     get_last_commit_date_path,
     get_last_sync,
@@ -55,6 +59,59 @@ class TestConfig:
         assert loaded.output.auto_push is False
         assert loaded.sync.interval == 600
 
+    def test_load_reflects_file_changes(self, tmp_path: Path) -> None:
+        """Loading again after the file changes should not return stale values."""
+        config_path = tmp_path / "config.toml"
+
+        config = Config()
+        config.sync.interval = 600
+        config.save(config_path)
+        assert Config.load(config_path).sync.interval == 600
+
+        config.sync.interval = 3600
+        config.save(config_path)
+        assert Config.load(config_path).sync.interval == 3600
+
+    def test_load_reflects_same_size_changes(self, tmp_path: Path) -> None:
+        """Edits that keep the file size unchanged should still be picked up."""
+        config_path = tmp_path / "config.toml"
+
+        config_path.write_text("[sync]\ninterval = 600\n")
+        assert Config.load(config_path).sync.interval == 600
+
+        config_path.write_text("[sync]\ninterval = 700\n")
+        assert Config.load(config_path).sync.interval == 700
+
+    def test_load_cached_reuses_config_until_file_changes(self, tmp_path: Path) -> None:
+        """load_cached should return the same object until the file or cache changes."""
+        config_path = tmp_path / "config.toml"
+        config_path.write_text("[sync]\ninterval = 600\n")
+
+        first = Config.load_cached(config_path)
+        assert Config.load_cached(config_path) is first
+
+        config_path.write_text("[sync]\ninterval = 3600\n")
+        second = Config.load_cached(config_path)
+        assert second.sync.interval == 3600
+
+        clear_config_cache()
+        assert Config.load_cached(config_path) is not second
+
+        config_path.unlink()
+        assert Config.load_cached(config_path).sync.interval == 300
+
+    def test_save_escapes_special_characters(self, tmp_path: Path) -> None:
+        """Paths containing quotes or backslashes should survive a save/load round-trip."""
+        config_path = tmp_path / "config.toml"
+
+        config = Config()
+        config.output.repository = tmp_path / 'logs "quoted" \\ dir'
+        config.save(config_path)
+
+        loaded = Config.load(config_path)
+
+        assert loaded.output.repository == tmp_path / 'logs "quoted" \\ dir'
+
     def test_load_with_aliases(self, tmp_path: Path) -> None:
         """Config should load project aliases."""
         config_path = tmp_path / "config.toml"
@@ -70,6 +127,22 @@ structure = "date"
         config = Config.load(config_path)
         assert config.output.structure == "date"
 
+    def test_save_and_load_aliases(self, tmp_path: Path) -> None:
+        """Project aliases should round-trip, including keys that need escaping."""
+        config_path = tmp_path / "config.toml"
+
+        config = Config()
+        config.project_aliases = {
+            "/path/to/project": "my-alias",
+            '/path/with "quotes"': "quoted",
+            "C:\\Users\\me\\repo": "windows",
+        }
+        config.save(config_path)
+
+        loaded = Config.load(config_path)
+
+        assert loaded.project_aliases == config.project_aliases
+
 
 class TestLastSync:
     """Tests for last_sync functions."""
@@ -91,6 +164,30 @@ class TestLastSync:
         # Compare with 1 second tolerance
         assert abs((result - now).total_seconds()) < 1
 
+    def test_save_last_sync_creates_parent_and_leaves_no_temp_file(self, tmp_path: Path) -> None:
+        """save_last_sync should create missing directories and replace the file in place."""
+        last_sync_path = tmp_path / "nested" / "last_sync"
+
+        save_last_sync(datetime(2026, 1, 1, tzinfo=UTC), last_sync_path)
+        save_last_sync(datetime(2026, 1, 2, tzinfo=UTC), last_sync_path)
+
+        assert get_last_sync(last_sync_path) == datetime(2026, 1, 2, tzinfo=UTC)
+        assert [p.name for p in last_sync_path.parent.iterdir()] == ["last_sync"]
+
+    def test_failed_save_leaves_no_temp_file(self, tmp_path: Path) -> None:
+        """A write that fails before the rename should remove its temporary file."""
+        last_sync_path = tmp_path / "last_sync"
+        save_last_sync(datetime(2026, 1, 1, tzinfo=UTC), last_sync_path)
+
+        with (
+            patch("ccjournal.config.os.replace", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            save_last_sync(datetime(2026, 1, 2, tzinfo=UTC), last_sync_path)
+
+        assert get_last_sync(last_sync_path) == datetime(2026, 1, 1, tzinfo=UTC)
+        assert [p.name for p in tmp_path.iterdir()] == ["last_sync"]
+
     def test_get_last_sync_invalid_content(self, tmp_path: Path) -> None:
         """get_last_sync returns None for invalid content."""
         last_sync_path = tmp_path / "last_sync"
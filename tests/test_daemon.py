@@ -1,10 +1,15 @@
 """Tests for the daemon module."""
 
 import os
+import select
 import signal
-from datetime import date
+import subprocess
+import threading
+import time
+from datetime import date, timedelta
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+
+import pytest
 
 from ccjournal.config import Config
 from ccjournal.daemon import (
@@ -34,43 +39,45 @@ class TestPidFile:
         assert pid_file.exists()
         assert pid_file.read_text() == "12345"
 
-    def test_read_pid_file_existing(self, tmp_path: Path) -> None:
-        """read_pid_file returns the PID from an existing file."""
-        pid_file = tmp_path / "test.pid"
-        pid_file.write_text("12345")
-
-        assert read_pid_file(pid_file) == 12345
-
-    def test_read_pid_file_nonexistent(self, tmp_path: Path) -> None:
-        """read_pid_file returns None for nonexistent file."""
-        pid_file = tmp_path / "nonexistent.pid"
-
-        assert read_pid_file(pid_file) is None
-
-    def test_read_pid_file_invalid_content(self, tmp_path: Path) -> None:
-        """read_pid_file returns None for invalid content."""
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            ("12345", 12345),
+            ("12345\n", 12345),
+            (None, None),
+            ("not a number", None),
+            ("", None),
+            ("  \n", None),
+            ("1.2", None),
+        ],
+        ids=["existing", "trailing-newline", "nonexistent", "invalid", "empty", "blank", "float"],
+    )
+    def test_read_pid_file(self, tmp_path: Path, content: str | None, expected: int | None) -> None:
+        """read_pid_file returns the PID, or None for a missing or invalid file."""
         pid_file = tmp_path / "test.pid"
-        pid_file.write_text("not a number")
+        if content is not None:
+            pid_file.write_text(content)
 
-        assert read_pid_file(pid_file) is None
+        assert read_pid_file(pid_file) == expected
 
 
 class TestIsProcessRunning:
     """Tests for is_process_running function."""
 
-    def test_current_process_is_running(self) -> None:
-        """Current process should be reported as running."""
-        assert is_process_running(os.getpid()) is True
-
-    def test_nonexistent_process(self) -> None:
-        """Nonexistent process should be reported as not running."""
-        # Use a very high PID that is unlikely to exist
-        assert is_process_running(999999999) is False
-
-    def test_invalid_pid(self) -> None:
-        """Invalid PID should be reported as not running."""
-        assert is_process_running(-1) is False
-        assert is_process_running(0) is False
+    @pytest.mark.parametrize(
+        ("pid", "expected"),
+        [
+            (os.getpid(), True),
+            # Use a very high PID that is unlikely to exist
+            (999999999, False),
+            (-1, False),
+            (0, False),
+        ],
+        ids=["self", "nonexistent", "negative", "zero"],
+    )
+    def test_is_process_running(self, pid: int, expected: bool) -> None:
+        """Only live processes with a positive PID are reported as running."""
+        assert is_process_running(pid) is expected
 
 
 class TestDaemonStatus:
@@ -127,22 +134,55 @@ class TestStopDaemon:
         assert result is False
         assert not pid_file.exists()
 
-    @patch("ccjournal.daemon.os.kill")
-    def test_stop_daemon_running(self, mock_kill: MagicMock, tmp_path: Path) -> None:
+    def test_stop_daemon_running(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         """stop_daemon sends SIGTERM to running process."""
         pid_file = tmp_path / "test.pid"
         pid_file.write_text("12345")
+        calls: list[tuple[int, int]] = []
+        monkeypatch.setattr("ccjournal.daemon.os.kill", lambda pid, sig: calls.append((pid, sig)))
+        monkeypatch.setattr("ccjournal.daemon.is_process_running", lambda pid: True)
+        monkeypatch.setattr("ccjournal.daemon._wait_for_exit", lambda pid, timeout: None)
+
+        result = stop_daemon(pid_file)
 
-        with patch("ccjournal.daemon.is_process_running", return_value=True):
-            result = stop_daemon(pid_file)
+        assert result is True
+        assert calls == [(12345, signal.SIGTERM)]
+
+    @pytest.mark.skipif(
+        not (hasattr(os, "pidfd_open") or hasattr(select, "kqueue")),
+        reason="requires pidfd or kqueue",
+    )
+    @pytest.mark.slow
+    def test_stop_daemon_returns_once_process_exits(self, tmp_path: Path) -> None:
+        """stop_daemon returns as soon as the process exits, well before the timeout."""
+        pid_file = tmp_path / "test.pid"
+        process = subprocess.Popen(["sleep", "30"])
+        pid_file.write_text(str(process.pid))
+
+        try:
+            start = time.monotonic()
+            result = stop_daemon(pid_file, timeout=10)
+            elapsed = time.monotonic() - start
+        finally:
+            process.kill()
+            process.wait()
 
         assert result is True
-        mock_kill.assert_called_once_with(12345, signal.SIGTERM)
+        assert elapsed < 5
 
 
 class TestDaemonProcess:
     """Tests for DaemonProcess class."""
 
+    @pytest.fixture
+    def daemon(self, tmp_path: Path) -> DaemonProcess:
+        """DaemonProcess with default config and paths under tmp_path."""
+        return DaemonProcess(
+            config=Config(),
+            pid_file_path=tmp_path / "test.pid",
+            last_commit_path=tmp_path / "last_commit",
+        )
+
     def test_daemon_process_creation(self, tmp_path: Path) -> None:
         """DaemonProcess can be created with config and paths."""
         config = Config()
@@ -160,62 +200,122 @@ class TestDaemonProcess:
         assert daemon.last_commit_path == last_commit_path
         assert daemon.running is False
 
-    def test_should_commit_first_run(self, tmp_path: Path) -> None:
+    def test_should_commit_first_run(self, daemon: DaemonProcess) -> None:
         """should_commit returns True on first run (no last_commit file)."""
-        config = Config()
-        daemon = DaemonProcess(
-            config=config,
-            pid_file_path=tmp_path / "test.pid",
-            last_commit_path=tmp_path / "last_commit",
-        )
-
         assert daemon.should_commit() is True
 
-    def test_should_commit_same_day(self, tmp_path: Path) -> None:
+    def test_should_commit_same_day(self, daemon: DaemonProcess) -> None:
         """should_commit returns False if already committed today."""
-        config = Config()
-        last_commit_path = tmp_path / "last_commit"
-        last_commit_path.write_text(date.today().isoformat())
-
-        daemon = DaemonProcess(
-            config=config,
-            pid_file_path=tmp_path / "test.pid",
-            last_commit_path=last_commit_path,
-        )
+        daemon.last_commit_path.write_text(date.today().isoformat())
 
         assert daemon.should_commit() is False
 
-    def test_should_commit_different_day(self, tmp_path: Path) -> None:
+    def test_should_commit_different_day(self, daemon: DaemonProcess) -> None:
         """should_commit returns True if last commit was on a different day."""
-        config = Config()
-        last_commit_path = tmp_path / "last_commit"
-        # Write yesterday's date
-        from datetime import timedelta
-
         yesterday = date.today() - timedelta(days=1)
-        last_commit_path.write_text(yesterday.isoformat())
+        daemon.last_commit_path.write_text(yesterday.isoformat())
+
+        assert daemon.should_commit() is True
+
+    def test_stop_sets_running_false(self, daemon: DaemonProcess) -> None:
+        """stop() sets running to False."""
+        daemon.running = True
+
+        daemon.stop()
+
+        assert daemon.running is False
+
+    def test_wait_returns_after_timeout(self, daemon: DaemonProcess) -> None:
+        """_wait returns after the timeout and leaves the daemon running."""
+        daemon.running = True
+
+        daemon._wait(0.05)
+
+        assert daemon.running is True
 
+    def test_wait_returns_immediately_when_stopped(self, daemon: DaemonProcess) -> None:
+        """_wait does not sleep once the daemon has been stopped."""
+        start = time.monotonic()
+        daemon._wait(30)
+
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.skipif(not hasattr(signal, "sigtimedwait"), reason="requires sigtimedwait")
+    @pytest.mark.slow
+    def test_wait_interrupted_by_sigterm(self, daemon: DaemonProcess) -> None:
+        """SIGTERM ends the wait early and stops the daemon."""
+        daemon.running = True
+        main_thread = threading.get_ident()
+        timer = threading.Timer(0.1, signal.pthread_kill, (main_thread, signal.SIGTERM))
+
+        start = time.monotonic()
+        timer.start()
+        try:
+            daemon._wait(30)
+        finally:
+            timer.cancel()
+
+        assert daemon.running is False
+        assert time.monotonic() - start < 5
+
+    @pytest.mark.skipif(not hasattr(signal, "sigtimedwait"), reason="requires sigtimedwait")
+    @pytest.mark.slow
+    def test_wait_interrupted_by_sighup(self, daemon: DaemonProcess) -> None:
+        """SIGHUP ends the wait early and requests a reload without stopping."""
+        daemon.running = True
+        main_thread = threading.get_ident()
+        timer = threading.Timer(0.1, signal.pthread_kill, (main_thread, signal.SIGHUP))
+
+        start = time.monotonic()
+        timer.start()
+        try:
+            daemon._wait(30)
+        finally:
+            timer.cancel()
+
+        assert daemon.running is True
+        assert daemon._reload_requested is True
+        assert time.monotonic() - start < 5
+
+    def test_reload_config_picks_up_changes(self, tmp_path: Path) -> None:
+        """The config file is reloaded when it changes, and kept when it becomes invalid."""
+        config_path = tmp_path / "config.toml"
+        config_path.write_text("[sync]\ninterval = 600\n")
         daemon = DaemonProcess(
-            config=config,
+            config=Config(),
             pid_file_path=tmp_path / "test.pid",
-            last_commit_path=last_commit_path,
+            last_commit_path=tmp_path / "last_commit",
+            config_path=config_path,
         )
 
-        assert daemon.should_commit() is True
+        daemon._reload_config()
+        assert daemon.config.sync.interval == 600
 
-    def test_stop_sets_running_false(self, tmp_path: Path) -> None:
-        """stop() sets running to False."""
-        config = Config()
+        config_path.write_text("[sync]\ninterval = 3600\n")
+        daemon._reload_config()
+        assert daemon.config.sync.interval == 3600
+
+        config_path.write_text("[sync\n")
+        daemon._reload_config()
+        assert daemon.config.sync.interval == 3600
+
+    def test_reload_config_keeps_config_when_file_is_missing(self, tmp_path: Path) -> None:
+        """A config file that disappears between reloads should not reset to the defaults."""
+        config_path = tmp_path / "config.toml"
+        config_path.write_text(f'[output]\nrepository = "{tmp_path / "logs"}"\n')
         daemon = DaemonProcess(
-            config=config,
+            config=Config(),
             pid_file_path=tmp_path / "test.pid",
             last_commit_path=tmp_path / "last_commit",
+            config_path=config_path,
         )
-        daemon.running = True
 
-        daemon.stop()
+        daemon._reload_config()
+        assert daemon.config.output.repository == tmp_path / "logs"
 
-        assert daemon.running is False
+        config_path.unlink()
+        daemon._reload_config()
+        assert daemon.config.output.repository == tmp_path / "logs"
 
 
 class TestServicePaths:
@@ -256,6 +356,18 @@ class TestServicePaths:
         assert ".config/ccjournal" in str(path)
 
 
+@pytest.fixture(scope="module")
+def sample_plist() -> str:
+    """Plist rendered once for the tests that only check static keys."""
+    return generate_launchd_plist("/bin/ccjournal", Path("/tmp/log"))
+
+
+@pytest.fixture(scope="module")
+def sample_systemd() -> str:
+    """Unit file rendered once for the tests that only check static sections."""
+    return generate_systemd_service("/bin/ccjournal", Path("/tmp/log"))
+
+
 class TestGenerateLaunchdPlist:
     """Tests for generate_launchd_plist function."""
 
@@ -270,12 +382,10 @@ class TestGenerateLaunchdPlist:
         assert "<!DOCTYPE plist" in content
         assert '<plist version="1.0">' in content
 
-    def test_contains_label(self) -> None:
+    def test_contains_label(self, sample_plist: str) -> None:
         """generate_launchd_plist includes correct label."""
-        content = generate_launchd_plist("/bin/ccjournal", Path("/tmp/log"))
-
-        assert "<key>Label</key>" in content
-        assert "<string>com.ccjournal.daemon</string>" in content
+        assert "<key>Label</key>" in sample_plist
+        assert "<string>com.ccjournal.daemon</string>" in sample_plist
 
     def test_contains_program_arguments(self) -> None:
         """generate_launchd_plist includes program arguments."""
@@ -288,18 +398,14 @@ class TestGenerateLaunchdPlist:
         assert "<string>start</string>" in content
         assert "<string>--foreground</string>" in content
 
-    def test_contains_run_at_load(self) -> None:
+    def test_contains_run_at_load(self, sample_plist: str) -> None:
         """generate_launchd_plist sets RunAtLoad to true."""
-        content = generate_launchd_plist("/bin/ccjournal", Path("/tmp/log"))
+        assert "<key>RunAtLoad</key>" in sample_plist
+        assert "<true/>" in sample_plist
 
-        assert "<key>RunAtLoad</key>" in content
-        assert "<true/>" in content
-
-    def test_contains_keep_alive(self) -> None:
+    def test_contains_keep_alive(self, sample_plist: str) -> None:
         """generate_launchd_plist sets KeepAlive to true."""
-        content = generate_launchd_plist("/bin/ccjournal", Path("/tmp/log"))
-
-        assert "<key>KeepAlive</key>" in content
+        assert "<key>KeepAlive</key>" in sample_plist
 
     def test_contains_log_paths(self) -> None:
         """generate_launchd_plist includes log paths."""
@@ -314,13 +420,11 @@ class TestGenerateLaunchdPlist:
 class TestGenerateSystemdService:
     """Tests for generate_systemd_service function."""
 
-    def test_contains_unit_section(self) -> None:
+    def test_contains_unit_section(self, sample_systemd: str) -> None:
         """generate_systemd_service includes Unit section."""
-        content = generate_systemd_service("/bin/ccjournal", Path("/tmp/log"))
-
-        assert "[Unit]" in content
-        assert "Description=ccjournal" in content
-        assert "After=network.target" in content
+        assert "[Unit]" in sample_systemd
+        assert "Description=ccjournal" in sample_systemd
+        assert "After=network.target" in sample_systemd
 
     def test_contains_service_section(self) -> None:
         """generate_systemd_service includes Service section."""
@@ -333,12 +437,10 @@ class TestGenerateSystemdService:
         assert "Restart=on-failure" in content
         assert "RestartSec=10" in content
 
-    def test_contains_install_section(self) -> None:
+    def test_contains_install_section(self, sample_systemd: str) -> None:
         """generate_systemd_service includes Install section."""
-        content = generate_systemd_service("/bin/ccjournal", Path("/tmp/log"))
-
-        assert "[Install]" in content
-        assert "WantedBy=default.target" in content
+        assert "[Install]" in sample_systemd
+        assert "WantedBy=default.target" in sample_systemd
 
     def test_contains_log_paths(self) -> None:
         """generate_systemd_service includes log paths."""
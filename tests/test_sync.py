@@ -1,181 +1,423 @@
 """Tests for the sync module."""
 
-from datetime import UTC, datetime
+import http.client
+import os
+import subprocess
+from collections import namedtuple
+from collections.abc import Callable
+from datetime import UTC, date, datetime
 from pathlib import Path
-from unittest.mock import patch
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from ccjournal.config import Config
-from ccjournal.parser import Message
+from ccjournal.parser import Message, parse_session_tail
 from ccjournal.sync import (
     ProjectSession,
     PublicRepositoryError,
     RepositoryVisibility,
+    _parse_in_process_pool,
     check_push_permission,
     check_repository_visibility,
+    clear_visibility_cache,
+    collect_sessions,
+    collect_sessions_grouped,
+    discover_sessions,
     format_message_markdown,
     format_session_markdown,
     generate_output_path,
+    git_commit_and_push,
     split_session_by_date,
+    sync_logs,
     write_markdown_file,
 )
 
+SessionFactory = Callable[..., ProjectSession]
+MessageFactory = Callable[..., Message]
+
+# Stand-in for subprocess.CompletedProcess in mocked subprocess.run calls
+Result = namedtuple("Result", ["returncode", "stdout"])
+
+
+def _write_session(path: Path, *contents: str) -> None:
+    """Write a session file with one user message per content string."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "".join(
+            f'{{"type": "user", "timestamp": "2024-01-15T10:{i:02d}:00Z", '
+            f'"message": {{"content": "{content}"}}}}\n'
+            for i, content in enumerate(contents)
+        )
+    )
+
+
+def _assert_contains_all(text: str, *needles: str) -> None:
+    """Assert that every needle occurs in text, reporting all that are missing."""
+    missing = [needle for needle in needles if needle not in text]
+    assert not missing, f"missing from output: {missing}"
+
+
+@pytest.fixture(scope="module")
+def sample_session(make_session: SessionFactory, make_message: MessageFactory) -> ProjectSession:
+    """Two-message session shared by tests that only read it."""
+    return make_session(
+        [
+            make_message(datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC), "Hello"),
+            make_message(datetime(2024, 1, 15, 10, 45, 0, tzinfo=UTC), "Hi", type="assistant"),
+        ],
+    )
+
+
+@pytest.fixture
+def output_dir(shared_output_root: Path, request: pytest.FixtureRequest) -> Path:
+    """Per-test subdirectory of the shared output root, named after the test."""
+    return shared_output_root / request.node.name
+
 
 class TestFormatMessageMarkdown:
     """Tests for format_message_markdown function."""
 
-    def test_format_user_message(self) -> None:
-        """User messages should be formatted correctly."""
-        msg = Message(
-            type="user",
-            timestamp=datetime(2024, 1, 15, 10, 30, 15, tzinfo=UTC),
-            content="Hello, world!",
-        )
+    @pytest.mark.parametrize(
+        ("msg_type", "timestamp", "content", "expected_header"),
+        [
+            (
+                "user",
+                datetime(2024, 1, 15, 10, 30, 15, tzinfo=UTC),
+                "Hello, world!",
+                "### 10:30:15 User",
+            ),
+            (
+                "assistant",
+                datetime(2024, 1, 15, 10, 31, 0, tzinfo=UTC),
+                "Hi there!",
+                "### 10:31:00 Assistant",
+            ),
+        ],
+        ids=["user", "assistant"],
+    )
+    def test_format_message(
+        self, msg_type: str, timestamp: datetime, content: str, expected_header: str
+    ) -> None:
+        """User and assistant messages should be formatted with a timed header."""
+        msg = Message(type=msg_type, timestamp=timestamp, content=content)
 
         result = format_message_markdown(msg)
 
-        assert "### 10:30:15 User" in result
-        assert "Hello, world!" in result
+        assert expected_header in result
+        assert content in result
 
-    def test_format_assistant_message(self) -> None:
-        """Assistant messages should be formatted correctly."""
-        msg = Message(
-            type="assistant",
-            timestamp=datetime(2024, 1, 15, 10, 31, 0, tzinfo=UTC),
-            content="Hi there!",
-        )
 
-        result = format_message_markdown(msg)
+class TestDiscoverSessions:
+    """Tests for discover_sessions function."""
 
-        assert "### 10:31:00 Assistant" in result
-        assert "Hi there!" in result
+    def test_missing_projects_directory(self, tmp_path: Path) -> None:
+        """A missing projects directory should yield nothing."""
+        assert list(discover_sessions(tmp_path / "missing")) == []
 
+    def test_projects_path_is_a_file(self, tmp_path: Path) -> None:
+        """A regular file where the projects directory should be should yield nothing."""
+        (tmp_path / "projects").write_text("")
 
-class TestFormatSessionMarkdown:
-    """Tests for format_session_markdown function."""
+        assert list(discover_sessions(tmp_path / "projects")) == []
 
-    def test_format_session(self) -> None:
-        """Session should be formatted with header and messages."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch="main",
-            messages=[
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC),
-                    content="Hello",
-                ),
-                Message(
-                    type="assistant",
-                    timestamp=datetime(2024, 1, 15, 10, 45, 0, tzinfo=UTC),
-                    content="Hi",
-                ),
-            ],
-        )
+    def test_only_project_directories_are_scanned(self, tmp_path: Path) -> None:
+        """Session files inside project directories are found; stray files are ignored."""
+        _write_session(tmp_path / "-nonexistent-proj" / "s1.jsonl", "Hello")
+        (tmp_path / "stray.jsonl").write_text("")
 
-        result = format_session_markdown(session)
+        found = list(discover_sessions(tmp_path))
 
-        assert "## Session: abc12345" in result
-        assert "10:30 - 10:45" in result
-        assert "**Branch:** main" in result
-        assert "Hello" in result
-        assert "Hi" in result
-
-    def test_empty_session(self) -> None:
-        """Empty session should return empty string."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch=None,
-            messages=[],
+        assert found == [
+            (tmp_path / "-nonexistent-proj" / "s1.jsonl", "s1", Path("/nonexistent/proj"))
+        ]
+
+    def test_since_filters_by_modification_time(self, tmp_path: Path) -> None:
+        """Only session files modified after since should be found."""
+        old_file = tmp_path / "-nonexistent-proj" / "old.jsonl"
+        new_file = tmp_path / "-nonexistent-proj" / "new.jsonl"
+        _write_session(old_file, "Old")
+        _write_session(new_file, "New")
+        (tmp_path / "-nonexistent-proj" / "notes.txt").write_text("")
+        since = datetime(2024, 1, 15, tzinfo=UTC)
+        os.utime(old_file, (since.timestamp(), since.timestamp()))
+        os.utime(new_file, (since.timestamp() + 1, since.timestamp() + 1))
+
+        found = list(discover_sessions(tmp_path, since=since))
+
+        assert [session_id for _, session_id, _ in found] == ["new"]
+
+    def test_unreadable_and_removed_project_directories_are_skipped(self, tmp_path: Path) -> None:
+        """Project directories that cannot be scanned should not stop discovery."""
+        _write_session(tmp_path / "-nonexistent-ok" / "s1.jsonl", "Hello")
+        _write_session(tmp_path / "-nonexistent-locked" / "s2.jsonl", "Hello")
+        real_scandir = os.scandir
+
+        def scandir(path: Path) -> Any:
+            name = Path(path).name
+            if name == "-nonexistent-locked":
+                raise PermissionError(path)
+            if name == "-nonexistent-gone":
+                raise FileNotFoundError(path)
+            return real_scandir(path)
+
+        (tmp_path / "-nonexistent-gone").mkdir()
+        with patch("ccjournal.sync.os.scandir", side_effect=scandir):
+            found = list(discover_sessions(tmp_path))
+
+        assert [session_id for _, session_id, _ in found] == ["s1"]
+
+    def test_project_path_follows_directories_created_later(self, tmp_path: Path) -> None:
+        """A project directory created after a discovery should be used by the next one."""
+        projects = tmp_path / "projects"
+        encoded = str(tmp_path / "my-project").replace("/", "-").replace(".", "-")
+        _write_session(projects / encoded / "s1.jsonl", "Hello")
+
+        [(_, _, before)] = discover_sessions(projects)
+        (tmp_path / "my-project").mkdir()
+        [(_, _, after)] = discover_sessions(projects)
+
+        assert before == tmp_path / "my" / "project"
+        assert after == tmp_path / "my-project"
+
+    def test_parallel_matches_serial(self, tmp_path: Path) -> None:
+        """Discovering many projects on a thread pool should keep the serial order."""
+        for i in range(12):
+            _write_session(tmp_path / f"-nonexistent-proj{i}" / "s.jsonl", f"m{i}")
+
+        with patch("ccjournal.sync._PARALLEL_DISCOVERY_THRESHOLD", 1000):
+            serial = list(discover_sessions(tmp_path))
+        with patch("ccjournal.sync._PARALLEL_DISCOVERY_THRESHOLD", 1):
+            parallel = list(discover_sessions(tmp_path))
+
+        assert len(serial) == 12
+        assert parallel == serial
+
+
+class TestCollectSessions:
+    """Tests for collect_sessions function."""
+
+    def test_collect_sessions(self, tmp_path: Path) -> None:
+        """Sessions with messages should be collected; empty ones skipped."""
+        _write_session(tmp_path / "-nonexistent-proj" / "s1.jsonl", "Hello", "Bye")
+        _write_session(tmp_path / "-nonexistent-proj" / "empty.jsonl")
+
+        with patch("ccjournal.sync.get_claude_projects_path", return_value=tmp_path):
+            sessions = collect_sessions(Config())
+
+        assert [s.session_id for s in sessions] == ["s1"]
+        assert [m.content for m in sessions[0].messages] == ["Hello", "Bye"]
+        assert sessions[0].project_name == "_local-proj"
+
+    def test_collect_sessions_grouped_splits_by_day(self, tmp_path: Path) -> None:
+        """Sessions spanning midnight should be grouped under each day they cover."""
+        session_file = tmp_path / "-nonexistent-proj" / "s1.jsonl"
+        session_file.parent.mkdir()
+        session_file.write_text(
+            '{"type": "user", "timestamp": "2024-01-15T23:50:00Z", '
+            '"message": {"content": "Late"}}\n'
+            '{"type": "user", "timestamp": "2024-01-16T00:10:00Z", '
+            '"message": {"content": "Early"}}\n'
         )
 
-        result = format_session_markdown(session)
+        with patch("ccjournal.sync.get_claude_projects_path", return_value=tmp_path):
+            grouped = collect_sessions_grouped(Config())
 
-        assert result == ""
+        assert {key: [m.content for s in v for m in s.messages] for key, v in grouped.items()} == {
+            ("_local-proj", date(2024, 1, 15)): ["Late"],
+            ("_local-proj", date(2024, 1, 16)): ["Early"],
+        }
 
-    def test_format_session_spanning_days(self) -> None:
-        """Session spanning multiple days should show (+N) indicator."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch="main",
-            messages=[
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 15, 22, 30, 0, tzinfo=UTC),
-                    content="Starting late",
-                ),
-                Message(
-                    type="assistant",
-                    timestamp=datetime(2024, 1, 16, 2, 45, 0, tzinfo=UTC),
-                    content="Still working",
-                ),
-            ],
-        )
+    def test_project_alias(self, tmp_path: Path) -> None:
+        """A configured alias should replace the derived project name."""
+        _write_session(tmp_path / "-nonexistent-proj" / "s1.jsonl", "Hello")
+        config = Config()
+        config.project_aliases = {"/nonexistent/proj": "my-alias"}
 
-        result = format_session_markdown(session)
+        with patch("ccjournal.sync.get_claude_projects_path", return_value=tmp_path):
+            sessions = collect_sessions(config)
+
+        assert [s.project_name for s in sessions] == ["my-alias"]
 
-        assert "22:30 - 02:45 (+1)" in result
+    def test_project_metadata_looked_up_once(self, tmp_path: Path) -> None:
+        """Sessions of the same project should share one name and branch lookup."""
+        project_dir = tmp_path / "projects" / f"-{str(tmp_path).strip('/').replace('/', '-')}"
+        for i in range(3):
+            _write_session(project_dir / f"s{i}.jsonl", f"m{i}")
+
+        with (
+            patch("ccjournal.sync.get_claude_projects_path", return_value=tmp_path / "projects"),
+            patch("ccjournal.sync.extract_project_name", return_value="proj") as mock_name,
+            patch("ccjournal.sync.get_git_branch", return_value="main") as mock_branch,
+        ):
+            sessions = collect_sessions(Config())
+
+        assert len(sessions) == 3
+        assert {(s.project_name, s.branch) for s in sessions} == {("proj", "main")}
+        assert mock_name.call_count == 1
+        assert mock_branch.call_count == 1
+
+    @pytest.mark.slow
+    def test_parallel_matches_serial(self, tmp_path: Path) -> None:
+        """Parsing in worker processes should give the same sessions in the same order."""
+        for i in range(12):
+            _write_session(tmp_path / f"-nonexistent-proj{i % 3}" / f"s{i}.jsonl", f"m{i}")
+
+        with patch("ccjournal.sync.get_claude_projects_path", return_value=tmp_path):
+            with patch("ccjournal.sync._PARALLEL_PARSE_THRESHOLD", 1000):
+                serial = collect_sessions(Config())
+            with (
+                patch.dict("ccjournal.sync._parse_cache", clear=True),
+                patch("ccjournal.sync._PARALLEL_PARSE_THRESHOLD", 2),
+                patch("ccjournal.sync.os.cpu_count", return_value=4),
+            ):
+                parallel = collect_sessions(Config())
+
+        assert len(serial) == 12
+        assert parallel == serial
+
+    def test_parse_falls_back_to_serial_without_process_pool(self, tmp_path: Path) -> None:
+        """Sessions should still be parsed when a process pool cannot be created."""
+        for i in range(4):
+            _write_session(tmp_path / "-nonexistent-proj" / f"s{i}.jsonl", f"m{i}")
+
+        with (
+            patch("ccjournal.sync.get_claude_projects_path", return_value=tmp_path),
+            patch("ccjournal.sync._PARALLEL_PARSE_THRESHOLD", 2),
+            patch("ccjournal.sync.os.cpu_count", return_value=4),
+            patch("ccjournal.sync.ProcessPoolExecutor", side_effect=PermissionError),
+        ):
+            sessions = collect_sessions(Config())
 
-    def test_format_session_spanning_multiple_days(self) -> None:
+        assert len(sessions) == 4
+
+    @pytest.mark.slow
+    def test_parse_errors_in_workers_propagate(self, tmp_path: Path) -> None:
+        """A file that cannot be read in a worker should raise, not trigger a serial re-parse."""
+        session_files = [tmp_path / f"s{i}.jsonl" for i in range(4)]
+        for session_file in session_files[1:]:
+            _write_session(session_file, "Hello")
+
+        # Returning None would make the caller parse every file again serially
+        with pytest.raises(FileNotFoundError):
+            _parse_in_process_pool(2, session_files, [0] * 4, True, True, None)
+
+    def test_unchanged_files_are_not_reparsed(self, tmp_path: Path) -> None:
+        """A second collection should reuse messages from files that did not change."""
+        _write_session(tmp_path / "-nonexistent-proj" / "s1.jsonl", "Hello")
+
+        with (
+            patch("ccjournal.sync.get_claude_projects_path", return_value=tmp_path),
+            patch("ccjournal.sync.parse_session_tail", wraps=parse_session_tail) as mock_parse,
+        ):
+            first = collect_sessions(Config())
+            second = collect_sessions(Config())
+
+        assert second == first
+        assert mock_parse.call_count == 1
+
+    def test_appended_messages_are_parsed_from_previous_offset(self, tmp_path: Path) -> None:
+        """Messages appended to a session file should be added to those parsed before."""
+        session_file = tmp_path / "-nonexistent-proj" / "s1.jsonl"
+        _write_session(session_file, "Hello")
+        size = session_file.stat().st_size
+
+        with (
+            patch("ccjournal.sync.get_claude_projects_path", return_value=tmp_path),
+            patch("ccjournal.sync.parse_session_tail", wraps=parse_session_tail) as mock_parse,
+        ):
+            collect_sessions(Config())
+            with session_file.open("a") as f:
+                f.write(
+                    '{"type": "assistant", "timestamp": "2024-01-15T10:05:00Z", '
+                    '"message": {"content": "Hi there!"}}\n'
+                )
+            sessions = collect_sessions(Config())
+
+        assert [m.content for m in sessions[0].messages] == ["Hello", "Hi there!"]
+        assert mock_parse.call_args.args[1] == size
+
+
+class TestFormatSessionMarkdown:
+    """Tests for format_session_markdown function."""
+
+    def test_format_session(self, sample_session: ProjectSession) -> None:
+        """Session should be formatted with header and messages."""
+        result = format_session_markdown(sample_session)
+
+        _assert_contains_all(
+            result, "## Session: abc12345", "10:30 - 10:45", "**Branch:** main", "Hello", "Hi"
+        )
+
+    @pytest.mark.parametrize(
+        ("start", "end", "expected"),
+        [
+            (
+                datetime(2024, 1, 15, 22, 30, 0, tzinfo=UTC),
+                datetime(2024, 1, 16, 2, 45, 0, tzinfo=UTC),
+                "22:30 - 02:45 (+1)",
+            ),
+            (
+                datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC),
+                datetime(2024, 1, 17, 15, 45, 0, tzinfo=UTC),
+                "10:30 - 15:45 (+2)",
+            ),
+        ],
+        ids=["two-days", "three-days"],
+    )
+    def test_format_session_spanning_days(
+        self,
+        start: datetime,
+        end: datetime,
+        expected: str,
+        make_session: SessionFactory,
+        make_message: MessageFactory,
+    ) -> None:
         """Session spanning multiple days should show (+N) indicator."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch="main",
-            messages=[
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC),
-                    content="Day 1",
-                ),
-                Message(
-                    type="assistant",
-                    timestamp=datetime(2024, 1, 17, 15, 45, 0, tzinfo=UTC),
-                    content="Day 3",
-                ),
+        session = make_session(
+            [
+                make_message(start, "Starting"),
+                make_message(end, "Still working", type="assistant"),
             ],
         )
 
         result = format_session_markdown(session)
 
-        assert "10:30 - 15:45 (+2)" in result
+        assert expected in result
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> Config:
+    """Default config writing into the test's temporary directory."""
+    config = Config()
+    config.output.repository = tmp_path
+    return config
 
 
 class TestGenerateOutputPath:
     """Tests for generate_output_path function."""
 
-    def test_date_structure(self, tmp_path: Path) -> None:
+    def test_date_structure(self, config: Config) -> None:
         """Date structure should create YYYY/MM/DD/project.md path."""
-        config = Config()
-        config.output.repository = tmp_path
         config.output.structure = "date"
 
         date = datetime(2024, 1, 15)
         result = generate_output_path(config, "my-project", date)
 
-        assert result == tmp_path / "2024" / "01" / "15" / "my-project.md"
+        assert result == config.output.repository / "2024" / "01" / "15" / "my-project.md"
 
-    def test_project_structure(self, tmp_path: Path) -> None:
+    def test_project_structure(self, config: Config) -> None:
         """Project structure should create project/YYYY-MM-DD.md path."""
-        config = Config()
-        config.output.repository = tmp_path
         config.output.structure = "project"
 
         date = datetime(2024, 1, 15)
         result = generate_output_path(config, "my-project", date)
 
-        assert result == tmp_path / "my-project" / "2024-01-15.md"
+        assert result == config.output.repository / "my-project" / "2024-01-15.md"
 
-    def test_sanitize_project_name(self, tmp_path: Path) -> None:
+    def test_sanitize_project_name(self, config: Config) -> None:
         """Project names with slashes should be sanitized."""
-        config = Config()
-        config.output.repository = tmp_path
         config.output.structure = "date"
 
         date = datetime(2024, 1, 15)
@@ -183,105 +425,210 @@ class TestGenerateOutputPath:
 
         assert "github.com-user-repo.md" in str(result)
 
+        result = generate_output_path(config, "C:\\work\\repo", date)
+
+        assert result.name == "C:-work-repo.md"
+
 
 class TestWriteMarkdownFile:
     """Tests for write_markdown_file function."""
 
-    def test_write_file(self, tmp_path: Path) -> None:
+    def test_write_file(self, output_dir: Path, sample_session: ProjectSession) -> None:
         """Should write markdown file with proper content."""
-        output_path = tmp_path / "2024" / "01" / "15" / "project.md"
-
-        sessions = [
-            ProjectSession(
-                session_id="abc12345",
-                project_name="my-project",
-                project_path=Path("/path/to/project"),
-                branch="main",
-                messages=[
-                    Message(
-                        type="user",
-                        timestamp=datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC),
-                        content="Hello",
-                    ),
-                ],
-            ),
-        ]
+        output_path = output_dir / "2024" / "01" / "15" / "project.md"
 
         write_markdown_file(
             output_path,
             "my-project",
             datetime(2024, 1, 15),
-            sessions,
+            [sample_session],
         )
 
         assert output_path.exists()
         content = output_path.read_text()
-        assert "# my-project - 2024-01-15" in content
-        assert "Hello" in content
-
-
-class TestCheckRepositoryVisibility:
-    """Tests for check_repository_visibility function."""
-
-    def test_private_repository(self, tmp_path: Path) -> None:
-        """Private GitHub repository should return PRIVATE."""
-        with patch("ccjournal.sync.subprocess.run") as mock_run:
-            mock_remote = type(
-                "Result", (), {"returncode": 0, "stdout": "git@github.com:user/repo.git\n"}
-            )()
-            mock_gh = type("Result", (), {"returncode": 0, "stdout": "true\n"})()
-            mock_run.side_effect = [mock_remote, mock_gh]
-
-            result = check_repository_visibility(tmp_path)
+        _assert_contains_all(content, "# my-project - 2024-01-15", "Hello")
+
+    def test_unchanged_file_not_rewritten(
+        self,
+        output_dir: Path,
+        make_session: SessionFactory,
+        make_message: MessageFactory,
+    ) -> None:
+        """Writing identical content should leave the existing file untouched."""
+        output_path = output_dir / "project.md"
+        sessions = [
+            make_session(
+                [
+                    make_message(datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC), "Hello"),
+                ],
+            ),
+        ]
 
-            assert result == RepositoryVisibility.PRIVATE
+        write_markdown_file(output_path, "my-project", datetime(2024, 1, 15), sessions)
+        os.utime(output_path, ns=(0, 0))
+        write_markdown_file(output_path, "my-project", datetime(2024, 1, 15), sessions)
+        assert output_path.stat().st_mtime_ns == 0
+
+        sessions[0].messages[0].content = "Hi"
+        write_markdown_file(output_path, "my-project", datetime(2024, 1, 15), sessions)
+        assert output_path.stat().st_mtime_ns != 0
+        assert "Hi" in output_path.read_text()
+
+    def test_rewrite_matches_fresh_write(
+        self, output_dir: Path, make_session: SessionFactory
+    ) -> None:
+        """Rewriting a longer or shorter existing file should give the same bytes as a new one."""
+        message = Message(
+            type="user",
+            timestamp=datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC),
+            content="Hello",
+        )
+        session = make_session([message])
+        output_path = output_dir / "project.md"
+        fresh_path = output_dir / "fresh.md"
+        date = datetime(2024, 1, 15)
 
-    def test_public_repository(self, tmp_path: Path) -> None:
-        """Public GitHub repository should return PUBLIC."""
-        with patch("ccjournal.sync.subprocess.run") as mock_run:
-            mock_remote = type(
-                "Result", (), {"returncode": 0, "stdout": "https://github.com/user/repo.git\n"}
-            )()
-            mock_gh = type("Result", (), {"returncode": 0, "stdout": "false\n"})()
-            mock_run.side_effect = [mock_remote, mock_gh]
+        for messages in ([message], [message, message, message], [message, message]):
+            session.messages = messages
+            write_markdown_file(output_path, "my-project", date, [session])
+            fresh_path.unlink(missing_ok=True)
+            write_markdown_file(fresh_path, "my-project", date, [session])
 
-            result = check_repository_visibility(tmp_path)
+            assert output_path.read_bytes() == fresh_path.read_bytes()
 
-            assert result == RepositoryVisibility.PUBLIC
 
-    def test_non_github_repository(self, tmp_path: Path) -> None:
-        """Non-GitHub repository should return UNKNOWN."""
-        with patch("ccjournal.sync.subprocess.run") as mock_run:
-            mock_remote = type(
-                "Result", (), {"returncode": 0, "stdout": "git@gitlab.com:user/repo.git\n"}
-            )()
-            mock_run.return_value = mock_remote
+class TestSyncLogs:
+    """Tests for sync_logs function."""
 
-            result = check_repository_visibility(tmp_path)
+    def test_sessions_written_in_start_order(
+        self,
+        tmp_path: Path,
+        make_session: SessionFactory,
+        make_message: MessageFactory,
+    ) -> None:
+        """Sessions sharing an output file should be written by start time."""
+        sessions = [
+            make_session(
+                [
+                    make_message(datetime(2024, 1, 15, hour, 0, 0, tzinfo=UTC), session_id),
+                ],
+                branch=None,
+                session_id=session_id,
+            )
+            for session_id, hour in [("later000", 15), ("earlier0", 9)]
+        ]
+        config = Config()
+        config.output.repository = tmp_path
 
-            assert result == RepositoryVisibility.UNKNOWN
+        with patch("ccjournal.sync._iter_project_sessions", return_value=iter(sessions)):
+            written = list(sync_logs(config))
 
-    def test_no_remote(self, tmp_path: Path) -> None:
-        """Repository without remote should return UNKNOWN."""
-        with patch("ccjournal.sync.subprocess.run") as mock_run:
-            mock_run.return_value = type("Result", (), {"returncode": 1, "stdout": ""})()
+        assert len(written) == 1
+        content = written[0].read_text()
+        assert content.index("Session: earlier0") < content.index("Session: later000")
 
-            result = check_repository_visibility(tmp_path)
 
-            assert result == RepositoryVisibility.UNKNOWN
+class TestCheckRepositoryVisibility:
+    """Tests for check_repository_visibility function."""
 
-    def test_gh_command_fails(self, tmp_path: Path) -> None:
-        """If gh command fails, should return UNKNOWN."""
-        with patch("ccjournal.sync.subprocess.run") as mock_run:
-            mock_remote = type(
-                "Result", (), {"returncode": 0, "stdout": "git@github.com:user/repo.git\n"}
-            )()
-            mock_gh = type("Result", (), {"returncode": 1, "stdout": ""})()
-            mock_run.side_effect = [mock_remote, mock_gh]
+    @pytest.fixture(autouse=True)
+    def _no_github_token(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Keep tests on the gh path unless they set a token themselves."""
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.delenv("GH_TOKEN", raising=False)
+        monkeypatch.setattr("ccjournal.sync._github_connection", None)
+
+    @pytest.mark.parametrize(
+        ("remote_returncode", "remote_stdout", "gh_result", "expected"),
+        [
+            (0, "git@github.com:user/repo.git\n", (0, "true\n"), RepositoryVisibility.PRIVATE),
+            (0, "https://github.com/user/repo.git\n", (0, "false\n"), RepositoryVisibility.PUBLIC),
+            (0, "git@gitlab.com:user/repo.git\n", None, RepositoryVisibility.UNKNOWN),
+            (1, "", None, RepositoryVisibility.UNKNOWN),
+            (0, "git@github.com:user/repo.git\n", (1, ""), RepositoryVisibility.UNKNOWN),
+        ],
+        ids=["private", "public", "non-github", "no-remote", "gh-fails"],
+    )
+    def test_visibility_from_gh(
+        self,
+        tmp_path: Path,
+        remote_returncode: int,
+        remote_stdout: str,
+        gh_result: tuple[int, str] | None,
+        expected: RepositoryVisibility,
+    ) -> None:
+        """Visibility should follow gh for GitHub remotes and be UNKNOWN otherwise."""
+        outputs = [(remote_returncode, remote_stdout)]
+        if gh_result is not None:
+            outputs.append(gh_result)
+        results = [Result(rc, out) for rc, out in outputs]
+
+        mock_run = MagicMock(side_effect=results)
+        result = check_repository_visibility(tmp_path, runner=mock_run)
+
+        assert result is expected
+        assert mock_run.call_count == len(results)
+
+    def test_github_api_with_token(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """With a token set, visibility should come from the API over one connection."""
+        monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+        mock_run = MagicMock(return_value=Result(0, "git@github.com:user/repo.git\n"))
+        with patch("http.client.HTTPSConnection") as mock_connection:
+            response = mock_connection.return_value.getresponse.return_value
+            response.status = 200
+            response.read.return_value = b'{"private": true}'
+
+            for _ in range(2):
+                visibility = check_repository_visibility(tmp_path, runner=mock_run)
+                assert visibility == RepositoryVisibility.PRIVATE
+
+            mock_connection.assert_called_once()
+            request = mock_connection.return_value.request
+            assert request.call_args.args == ("GET", "/repos/user/repo")
+            assert request.call_args.kwargs["headers"]["Authorization"] == "Bearer test-token"
+            # Only the remote URL lookups ran as subprocesses
+            assert mock_run.call_count == 2
+
+    def test_github_api_retries_closed_keep_alive_connection(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A reused connection closed by the server should be replaced, not fall back to gh."""
+        monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+        stale = MagicMock()
+        stale.getresponse.return_value.status = 200
+        stale.getresponse.return_value.read.return_value = b'{"private": true}'
+        fresh = MagicMock()
+        fresh.getresponse.return_value.status = 200
+        fresh.getresponse.return_value.read.return_value = b'{"private": false}'
+        mock_run = MagicMock(return_value=Result(0, "git@github.com:user/repo.git\n"))
+        with patch("http.client.HTTPSConnection", side_effect=[stale, fresh]):
+            visibility = check_repository_visibility(tmp_path, runner=mock_run)
+            assert visibility == RepositoryVisibility.PRIVATE
+            stale.request.side_effect = http.client.RemoteDisconnected("closed")
+            visibility = check_repository_visibility(tmp_path, runner=mock_run)
+            assert visibility == RepositoryVisibility.PUBLIC
+
+            stale.close.assert_called_once()
+            # Only the remote URL lookups ran as subprocesses
+            assert mock_run.call_count == 2
+
+    def test_github_api_failure_falls_back_to_gh(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A failed API request should fall back to the gh CLI."""
+        monkeypatch.setenv("GH_TOKEN", "test-token")
+        mock_run = MagicMock(
+            side_effect=[Result(0, "git@github.com:user/repo.git\n"), Result(0, "false\n")]
+        )
+        with patch("http.client.HTTPSConnection") as mock_connection:
+            mock_connection.return_value.request.side_effect = OSError("unreachable")
 
-            result = check_repository_visibility(tmp_path)
+            result = check_repository_visibility(tmp_path, runner=mock_run)
 
-            assert result == RepositoryVisibility.UNKNOWN
+            assert result == RepositoryVisibility.PUBLIC
+            assert mock_run.call_args.args[0][0] == "gh"
 
 
 class TestPublicRepositoryError:
@@ -300,100 +647,107 @@ class TestPublicRepositoryError:
 class TestCheckPushPermission:
     """Tests for check_push_permission function."""
 
-    def test_private_repository_allowed(self, tmp_path: Path) -> None:
-        """Private repositories should always be allowed."""
-        with patch(
-            "ccjournal.sync.check_repository_visibility",
-            return_value=RepositoryVisibility.PRIVATE,
-        ):
-            result = check_push_permission(
-                tmp_path, allow_public=False, allow_unknown=False
-            )
-
-            assert result.allowed is True
-            assert result.visibility == RepositoryVisibility.PRIVATE
-            assert result.warning_message is None
+    @pytest.mark.parametrize(
+        ("visibility", "allow_public", "allow_unknown", "expected_allowed", "warning"),
+        [
+            (RepositoryVisibility.PRIVATE, False, False, True, None),
+            (RepositoryVisibility.PUBLIC, False, False, False, "public repository"),
+            (RepositoryVisibility.PUBLIC, True, False, True, "public repository"),
+            (RepositoryVisibility.UNKNOWN, False, False, False, "unknown"),
+            (RepositoryVisibility.UNKNOWN, False, True, True, "unknown"),
+        ],
+        ids=[
+            "private",
+            "public-blocked",
+            "public-allowed",
+            "unknown-blocked",
+            "unknown-allowed",
+        ],
+    )
+    def test_permission(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        visibility: RepositoryVisibility,
+        allow_public: bool,
+        allow_unknown: bool,
+        expected_allowed: bool,
+        warning: str | None,
+    ) -> None:
+        """Pushes should be allowed per visibility and flags, warning unless private."""
+        monkeypatch.setattr(
+            "ccjournal.sync.check_repository_visibility", lambda repo_path: visibility
+        )
 
-    def test_public_repository_blocked_by_default(self, tmp_path: Path) -> None:
-        """Public repositories should be blocked when allow_public=False."""
-        with patch(
-            "ccjournal.sync.check_repository_visibility",
-            return_value=RepositoryVisibility.PUBLIC,
-        ):
-            result = check_push_permission(
-                tmp_path, allow_public=False, allow_unknown=False
-            )
+        result = check_push_permission(
+            tmp_path, allow_public=allow_public, allow_unknown=allow_unknown
+        )
 
-            assert result.allowed is False
-            assert result.visibility == RepositoryVisibility.PUBLIC
+        assert result.allowed is expected_allowed
+        assert result.visibility == visibility
+        if warning is None:
+            assert result.warning_message is None
+        else:
             assert result.warning_message is not None
-            assert "public repository" in result.warning_message.lower()
+            assert warning in result.warning_message.lower()
 
-    def test_public_repository_allowed_when_permitted(self, tmp_path: Path) -> None:
-        """Public repositories should be allowed when allow_public=True."""
+    def test_visibility_is_cached(self, tmp_path: Path) -> None:
+        """Repeated checks for the same repository should reuse the visibility lookup."""
         with patch(
             "ccjournal.sync.check_repository_visibility",
-            return_value=RepositoryVisibility.PUBLIC,
-        ):
-            result = check_push_permission(
-                tmp_path, allow_public=True, allow_unknown=False
-            )
+            return_value=RepositoryVisibility.PRIVATE,
+        ) as mock_check:
+            check_push_permission(tmp_path, allow_public=False, allow_unknown=False)
+            result = check_push_permission(tmp_path, allow_public=True, allow_unknown=True)
 
-            assert result.allowed is True
-            assert result.visibility == RepositoryVisibility.PUBLIC
-            assert result.warning_message is not None  # Warning still shown
+            assert result.visibility == RepositoryVisibility.PRIVATE
+            mock_check.assert_called_once_with(tmp_path)
 
-    def test_unknown_visibility_blocked_by_default(self, tmp_path: Path) -> None:
-        """Unknown visibility should be blocked when allow_unknown=False."""
+    def test_visibility_cache_keyed_on_resolved_path(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Relative and absolute paths to one repository should share a cache entry."""
+        monkeypatch.chdir(tmp_path.parent)
         with patch(
             "ccjournal.sync.check_repository_visibility",
-            return_value=RepositoryVisibility.UNKNOWN,
+            return_value=RepositoryVisibility.PRIVATE,
+        ) as mock_check:
+            check_push_permission(tmp_path, allow_public=False, allow_unknown=False)
+            check_push_permission(Path(tmp_path.name), allow_public=False, allow_unknown=False)
+            assert mock_check.call_count == 1
+
+            clear_visibility_cache()
+            check_push_permission(tmp_path, allow_public=False, allow_unknown=False)
+            assert mock_check.call_count == 2
+
+    def test_visibility_cache_expires(self, tmp_path: Path) -> None:
+        """Visibility should be looked up again once the cache entry has expired."""
+        with (
+            patch(
+                "ccjournal.sync.check_repository_visibility",
+                side_effect=[RepositoryVisibility.PRIVATE, RepositoryVisibility.PUBLIC],
+            ) as mock_check,
+            patch("ccjournal.sync.time.monotonic", side_effect=[1000.0, 2000.0]),
         ):
-            result = check_push_permission(
-                tmp_path, allow_public=False, allow_unknown=False
-            )
+            check_push_permission(tmp_path, allow_public=False, allow_unknown=False)
+            result = check_push_permission(tmp_path, allow_public=False, allow_unknown=False)
 
             assert result.allowed is False
-            assert result.visibility == RepositoryVisibility.UNKNOWN
-            assert result.warning_message is not None
-            assert "unknown" in result.warning_message.lower()
-
-    def test_unknown_visibility_allowed_when_permitted(self, tmp_path: Path) -> None:
-        """Unknown visibility should be allowed when allow_unknown=True."""
-        with patch(
-            "ccjournal.sync.check_repository_visibility",
-            return_value=RepositoryVisibility.UNKNOWN,
-        ):
-            result = check_push_permission(
-                tmp_path, allow_public=False, allow_unknown=True
-            )
-
-            assert result.allowed is True
-            assert result.visibility == RepositoryVisibility.UNKNOWN
-            assert result.warning_message is not None  # Warning still shown
+            assert result.visibility == RepositoryVisibility.PUBLIC
+            assert mock_check.call_count == 2
 
 
 class TestSplitSessionByDate:
     """Tests for split_session_by_date function."""
 
-    def test_single_day_session(self) -> None:
+    def test_single_day_session(
+        self, make_session: SessionFactory, make_message: MessageFactory
+    ) -> None:
         """Session within a single day should not be split."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch="main",
-            messages=[
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC),
-                    content="Hello",
-                ),
-                Message(
-                    type="assistant",
-                    timestamp=datetime(2024, 1, 15, 10, 45, 0, tzinfo=UTC),
-                    content="Hi",
-                ),
+        session = make_session(
+            [
+                make_message(datetime(2024, 1, 15, 10, 30, 0, tzinfo=UTC), "Hello"),
+                make_message(datetime(2024, 1, 15, 10, 45, 0, tzinfo=UTC), "Hi", type="assistant"),
             ],
         )
 
@@ -404,78 +758,40 @@ class TestSplitSessionByDate:
         assert date_key in result
         assert len(result[date_key].messages) == 2
 
-    def test_session_spanning_two_days(self) -> None:
+    def test_session_spanning_two_days(
+        self, make_session: SessionFactory, make_message: MessageFactory
+    ) -> None:
         """Session spanning two days should be split by date."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch="main",
-            messages=[
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 15, 23, 30, 0, tzinfo=UTC),
-                    content="Day 1 message",
-                ),
-                Message(
-                    type="assistant",
-                    timestamp=datetime(2024, 1, 15, 23, 45, 0, tzinfo=UTC),
-                    content="Day 1 response",
+        session = make_session(
+            [
+                make_message(datetime(2024, 1, 15, 23, 30, 0, tzinfo=UTC), "Day 1 message"),
+                make_message(
+                    datetime(2024, 1, 15, 23, 45, 0, tzinfo=UTC), "Day 1 response", type="assistant"
                 ),
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 16, 0, 15, 0, tzinfo=UTC),
-                    content="Day 2 message",
-                ),
-                Message(
-                    type="assistant",
-                    timestamp=datetime(2024, 1, 16, 0, 30, 0, tzinfo=UTC),
-                    content="Day 2 response",
+                make_message(datetime(2024, 1, 16, 0, 15, 0, tzinfo=UTC), "Day 2 message"),
+                make_message(
+                    datetime(2024, 1, 16, 0, 30, 0, tzinfo=UTC), "Day 2 response", type="assistant"
                 ),
             ],
         )
 
         result = split_session_by_date(session)
 
-        assert len(result) == 2
-
-        day1 = datetime(2024, 1, 15, 0, 0, 0, tzinfo=UTC)
-        day2 = datetime(2024, 1, 16, 0, 0, 0, tzinfo=UTC)
+        contents = {day: [m.content for m in split.messages] for day, split in result.items()}
+        assert contents == {
+            datetime(2024, 1, 15, 0, 0, 0, tzinfo=UTC): ["Day 1 message", "Day 1 response"],
+            datetime(2024, 1, 16, 0, 0, 0, tzinfo=UTC): ["Day 2 message", "Day 2 response"],
+        }
 
-        assert day1 in result
-        assert day2 in result
-
-        assert len(result[day1].messages) == 2
-        assert result[day1].messages[0].content == "Day 1 message"
-        assert result[day1].messages[1].content == "Day 1 response"
-
-        assert len(result[day2].messages) == 2
-        assert result[day2].messages[0].content == "Day 2 message"
-        assert result[day2].messages[1].content == "Day 2 response"
-
-    def test_session_spanning_multiple_days(self) -> None:
+    def test_session_spanning_multiple_days(
+        self, make_session: SessionFactory, make_message: MessageFactory
+    ) -> None:
         """Session spanning multiple days should create separate entries."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch="main",
-            messages=[
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC),
-                    content="Day 1",
-                ),
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 16, 10, 0, 0, tzinfo=UTC),
-                    content="Day 2",
-                ),
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 17, 10, 0, 0, tzinfo=UTC),
-                    content="Day 3",
-                ),
+        session = make_session(
+            [
+                make_message(datetime(2024, 1, 15, 10, 0, 0, tzinfo=UTC), "Day 1"),
+                make_message(datetime(2024, 1, 16, 10, 0, 0, tzinfo=UTC), "Day 2"),
+                make_message(datetime(2024, 1, 17, 10, 0, 0, tzinfo=UTC), "Day 3"),
             ],
         )
 
@@ -483,25 +799,16 @@ class TestSplitSessionByDate:
 
         assert len(result) == 3
 
-    def test_split_preserves_session_metadata(self) -> None:
+    def test_split_preserves_session_metadata(
+        self, make_session: SessionFactory, make_message: MessageFactory
+    ) -> None:
         """Split sessions should preserve original session metadata."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch="feature-branch",
-            messages=[
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 15, 23, 30, 0, tzinfo=UTC),
-                    content="Day 1",
-                ),
-                Message(
-                    type="user",
-                    timestamp=datetime(2024, 1, 16, 0, 30, 0, tzinfo=UTC),
-                    content="Day 2",
-                ),
+        session = make_session(
+            [
+                make_message(datetime(2024, 1, 15, 23, 30, 0, tzinfo=UTC), "Day 1"),
+                make_message(datetime(2024, 1, 16, 0, 30, 0, tzinfo=UTC), "Day 2"),
             ],
+            branch="feature-branch",
         )
 
         result = split_session_by_date(session)
@@ -512,16 +819,74 @@ class TestSplitSessionByDate:
             assert split_session.project_path == Path("/path/to/project")
             assert split_session.branch == "feature-branch"
 
-    def test_empty_session(self) -> None:
+    def test_empty_session(self, make_session: SessionFactory) -> None:
         """Empty session should return empty dict."""
-        session = ProjectSession(
-            session_id="abc12345",
-            project_name="my-project",
-            project_path=Path("/path/to/project"),
-            branch=None,
-            messages=[],
-        )
+        session = make_session([], branch=None)
 
         result = split_session_by_date(session)
 
         assert len(result) == 0
+
+
+class TestGitCommitAndPush:
+    """Tests for git_commit_and_push function."""
+
+    def test_no_changes(self, tmp_path: Path) -> None:
+        """A clean working tree should succeed after a single shell call, without pushing."""
+        with patch("ccjournal.sync.subprocess.run") as mock_run:
+            mock_run.return_value = Result(100, "")
+
+            result = git_commit_and_push(tmp_path)
+
+            assert result is True
+            mock_run.assert_called_once()
+            assert mock_run.call_args.args[0][:2] == ["sh", "-c"]
+
+    def test_commit_without_push(self, tmp_path: Path) -> None:
+        """Changes should be committed in one call and not pushed when auto_push is False."""
+        with patch("ccjournal.sync.subprocess.run") as mock_run:
+            mock_run.return_value = Result(0, "")
+
+            result = git_commit_and_push(tmp_path, auto_push=False)
+
+            assert result is True
+            mock_run.assert_called_once()
+
+    def test_commit_failure(self, tmp_path: Path) -> None:
+        """A failing add or commit should report failure and skip the push."""
+        with patch("ccjournal.sync.subprocess.run") as mock_run:
+            mock_run.return_value = Result(1, "")
+
+            result = git_commit_and_push(tmp_path)
+
+            assert result is False
+            mock_run.assert_called_once()
+
+    def test_commit_and_push(self, tmp_path: Path) -> None:
+        """After committing, the branch should be pushed to the remote."""
+        with patch("ccjournal.sync.subprocess.run") as mock_run:
+            mock_run.return_value = Result(0, "")
+
+            result = git_commit_and_push(tmp_path, remote="upstream", branch="logs")
+
+            assert result is True
+            assert mock_run.call_args.args[0] == ["git", "push", "upstream", "logs"]
+
+    @pytest.mark.slow
+    def test_commit_in_real_repository(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """New files should be committed once; a second run should find nothing to commit."""
+        for name in ("AUTHOR", "COMMITTER"):
+            monkeypatch.setenv(f"GIT_{name}_NAME", "ccjournal")
+            monkeypatch.setenv(f"GIT_{name}_EMAIL", "ccjournal@example.com")
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        (tmp_path / "log.md").write_text("# log\n")
+
+        assert git_commit_and_push(tmp_path, auto_push=False) is True
+        assert git_commit_and_push(tmp_path, auto_push=False) is True
+
+        log = subprocess.run(
+            ["git", "log", "--format=%s"], cwd=tmp_path, capture_output=True, text=True
+        )
+        assert log.stdout.count("Update conversation logs") == 1